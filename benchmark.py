@@ -0,0 +1,181 @@
+import argparse
+import asyncio
+import json
+import time
+
+import resource_blocking
+from fixture_server import start_server, expected_fields
+from resource_blocking import configure_chrome, enable_cdp_blocking, install_route_blocking
+from selector_registry import REGISTRY
+from telemetry import TELEMETRY
+
+# ==============================
+# CONFIG
+# ==============================
+ENGINES = ["selenium-linkedin", "selenium-facebook", "playwright-linkedin", "http-linkedin", "http-facebook"]
+FIELDS = ["name", "job_title", "company", "location"]
+
+# ==============================
+# HELPERS
+# ==============================
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+def accuracy(results, site, rates):
+    """Share of (profile, field) pairs that match the fixture's ground truth"""
+    hits = total = 0
+    for slug, data in results:
+        truth = expected_fields(site, slug, **rates)
+        for field in FIELDS:
+            total += 1
+            hits += (data.get(field) or "").strip() == truth[field]
+    return hits / total if total else 0.0
+
+def summarize(engine, site, latencies, results, wall, rates):
+    return {
+        "engine": engine,
+        "profiles": len(latencies),
+        "profiles_per_min": round(len(latencies) / wall * 60, 2) if wall else 0.0,
+        "p50_s": round(percentile(latencies, 50), 3),
+        "p95_s": round(percentile(latencies, 95), 3),
+        "accuracy": round(accuracy(results, site, rates), 4),
+    }
+
+def selenium_driver(headless=True):
+    from selenium import webdriver
+
+    options = webdriver.ChromeOptions()
+    options.add_argument("--window-size=1920,1080")
+    configure_chrome(options, headless=headless)
+    driver = webdriver.Chrome(options=options)
+    enable_cdp_blocking(driver)
+    return driver
+
+# ==============================
+# ENGINES
+# ==============================
+def run_selenium(engine, base_url, slugs, rates, headless):
+    if engine == "selenium-linkedin":
+        from scrape_Linkedin import scrape_profile
+        site, make_url = "linkedin", lambda s: f"{base_url}/in/{s}"
+    else:
+        from scrape_facebook import scrape_profile
+        site, make_url = "facebook", lambda s: f"{base_url}/{s}"
+
+    driver = selenium_driver(headless)
+    latencies, results = [], []
+    start = time.perf_counter()
+    try:
+        for slug in slugs:
+            t0 = time.perf_counter()
+            data = scrape_profile(make_url(slug), driver)
+            latencies.append(time.perf_counter() - t0)
+            results.append((slug, data))
+    finally:
+        driver.quit()
+    return summarize(engine, site, latencies, results, time.perf_counter() - start, rates)
+
+def run_http(engine, base_url, slugs, rates):
+    """HTTP tier alone; escalations count as empty results"""
+    from http_fetch import make_session, fetch_profile_http
+
+    site = engine.split("-", 1)[1]
+    make_url = (lambda s: f"{base_url}/in/{s}") if site == "linkedin" else (lambda s: f"{base_url}/{s}")
+    session = make_session("cookies.json")
+    latencies, results = [], []
+    start = time.perf_counter()
+    for slug in slugs:
+        t0 = time.perf_counter()
+        data = fetch_profile_http(session, make_url(slug), site) or {}
+        latencies.append(time.perf_counter() - t0)
+        results.append((slug, data))
+    return summarize(engine, site, latencies, results, time.perf_counter() - start, rates)
+
+async def run_playwright(engine, base_url, slugs, rates, headless, concurrency):
+    from playwright.async_api import async_playwright
+    from scrape_Linkedin import scrape_profile_async as scrape_profile
+
+    queue = asyncio.Queue()
+    for slug in slugs:
+        queue.put_nowait(slug)
+    latencies, results = [], []
+
+    async def bench_worker(context):
+        page = await context.new_page()
+        await install_route_blocking(page, "linkedin")
+        while not queue.empty():
+            slug = queue.get_nowait()
+            t0 = time.perf_counter()
+            data = await scrape_profile(f"{base_url}/in/{slug}", page)
+            latencies.append(time.perf_counter() - t0)
+            results.append((slug, data))
+        await page.close()
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        context = await browser.new_context()
+        start = time.perf_counter()
+        await asyncio.gather(*(bench_worker(context) for _ in range(max(1, concurrency))))
+        wall = time.perf_counter() - start
+        await browser.close()
+    return summarize(engine, "linkedin", latencies, results, wall, rates)
+
+# ==============================
+# MAIN
+# ==============================
+def main():
+    parser = argparse.ArgumentParser(description="Offline scraper throughput benchmark against fixture_server.py")
+    parser.add_argument("--engines", nargs="+", default=ENGINES, choices=ENGINES)
+    parser.add_argument("--profiles", type=int, default=20, help="synthetic profiles per engine")
+    parser.add_argument("--latency", type=float, default=0.0, help="fixed server latency per request (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random latency per request (s)")
+    parser.add_argument("--missing-rate", type=float, default=0.2, help="chance each optional field is absent")
+    parser.add_argument("--login-wall-rate", type=float, default=0.05, help="chance a profile redirects to a login wall")
+    parser.add_argument("--subpage-rate", type=float, default=0.5, help="chance Facebook work/places live only on about_* tabs")
+    parser.add_argument("--concurrency", type=int, default=3, help="pages for the Playwright engine")
+    parser.add_argument("--headed", action="store_true", help="show the browser windows")
+    parser.add_argument("--port", type=int, default=0, help="fixture server port (0 = any free port)")
+    parser.add_argument("--no-block", action="store_true", help="load every resource (baseline)")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+    resource_blocking.BLOCK_RESOURCES = not args.no_block
+    # Fixture pages must not train the production selector order or land in the run log
+    REGISTRY.stats_file = None
+    TELEMETRY.path = None
+
+    rates = {"missing_rate": args.missing_rate, "login_wall_rate": args.login_wall_rate,
+             "subpage_rate": args.subpage_rate}
+    server, base_url = start_server(port=args.port, latency=args.latency, jitter=args.jitter, **rates)
+    slugs = [f"alumni-{i:05d}" for i in range(args.profiles)]
+    print(f"Fixture server on {base_url}, {len(slugs)} profiles per engine")
+
+    report = []
+    try:
+        for engine in args.engines:
+            print(f"\n🚀 Benchmarking {engine}...")
+            if engine.startswith("selenium"):
+                row = run_selenium(engine, base_url, slugs, rates, not args.headed)
+            elif engine.startswith("http"):
+                row = run_http(engine, base_url, slugs, rates)
+            else:
+                row = asyncio.run(run_playwright(engine, base_url, slugs, rates, not args.headed, args.concurrency))
+            report.append(row)
+    finally:
+        server.shutdown()
+
+    print(f"\n{'engine':<22}{'profiles':>9}{'prof/min':>10}{'p50 s':>8}{'p95 s':>8}{'accuracy':>10}")
+    for row in report:
+        print(f"{row['engine']:<22}{row['profiles']:>9}{row['profiles_per_min']:>10}"
+              f"{row['p50_s']:>8}{row['p95_s']:>8}{row['accuracy']:>10.2%}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Report saved to {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+import os
+import re
+import sqlite3
+import threading
+from urllib.parse import urlparse, parse_qs, unquote
+
+import pandas as pd
+
+# ==============================
+# CONFIG
+# ==============================
+INDEX_FILE = "profile_index.sqlite"  # canonical profile key -> roster rows
+
+SITE_HOSTS = {"linkedin": "www.linkedin.com", "facebook": "www.facebook.com"}
+# Facebook vanity names are letters, digits and dots (no .php pages)
+VANITY_RE = re.compile(r"^(?!.*\.php$)[a-z0-9][a-z0-9.]*$")
+# First path segments that are Facebook features, not profiles
+FACEBOOK_RESERVED = {"p", "pg", "people", "pages", "groups", "watch", "events", "hashtag", "marketplace",
+                     "reel", "reels", "stories", "share", "photo", "photos", "videos", "gaming", "help",
+                     "settings", "login", "home", "friends", "messages", "notifications", "search",
+                     "checkpoint", "recover", "two_step_verification", "privacy", "policies",
+                     "legal", "sharer", "dialog", "ajax", "bookmarks", "business", "ads"}
+
+# ==============================
+# CANONICAL URLS
+# ==============================
+def site_of(url):
+    host = (urlparse(url).hostname or "").lower()
+    for site in SITE_HOSTS:
+        if host == f"{site}.com" or host.endswith(f".{site}.com"):
+            return site
+    return None
+
+def profile_key(url, site=None):
+    """Stable identity of a profile URL, e.g. 'linkedin:jane-doe-1234' or
+    'facebook:id:100004'; None when the URL is not a profile link.
+
+    Collapses country subdomains (bd.linkedin.com), m./web./mbasic. Facebook
+    hosts, case, trailing slashes, query strings and subpages like /about.
+    Numeric Facebook paths (/100004, /p/Name-100004/) share the id: key
+    with profile.php?id=100004.
+    """
+    if not isinstance(url, str) or not url.strip():
+        return None
+    url = url.strip()
+    if "://" not in url:
+        url = "https://" + url
+    site = site or site_of(url)
+    if site is None or site_of(url) != site:
+        return None
+    parsed = urlparse(url)
+    parts = [unquote(p).lower() for p in parsed.path.split("/") if p]
+
+    if site == "linkedin":
+        if len(parts) >= 2 and parts[0] in ("in", "pub"):
+            return f"linkedin:{parts[1]}"
+        return None
+
+    # facebook
+    if parts[:1] == ["profile.php"]:
+        ids = parse_qs(parsed.query).get("id")
+        return f"facebook:id:{ids[0]}" if ids and ids[0].isdigit() else None
+    if len(parts) >= 3 and parts[0] == "people" and parts[2].isdigit():
+        return f"facebook:id:{parts[2]}"
+    if len(parts) >= 2 and parts[0] == "p":
+        # /p/Adv-Md-Hafizur-Rahman-100020490100523/: the id is the last dash part
+        slug_id = parts[1].rsplit("-", 1)[-1]
+        return f"facebook:id:{slug_id}" if slug_id.isdigit() else None
+    if parts and parts[0].isdigit():
+        return f"facebook:id:{parts[0]}"
+    if parts and parts[0] not in FACEBOOK_RESERVED and VANITY_RE.match(parts[0]):
+        return f"facebook:{parts[0]}"
+    return None
+
+def key_url(key):
+    """The one URL we fetch for a profile key"""
+    site, _, rest = key.partition(":")
+    if site == "facebook" and rest.startswith("id:"):
+        return f"https://{SITE_HOSTS[site]}/profile.php?id={rest[3:]}"
+    if site == "linkedin":
+        return f"https://{SITE_HOSTS[site]}/in/{rest}"
+    return f"https://{SITE_HOSTS[site]}/{rest}"
+
+def canonical_url(url, site=None):
+    """Canonical form of a profile link, or None if it is not one"""
+    key = profile_key(url, site)
+    return key_url(key) if key else None
+
+def subpage_url(url, suffix):
+    """Append a subpage like '/about' to a profile URL; numeric Facebook
+    profiles take it as an sk= parameter instead"""
+    if not suffix:
+        return url
+    parsed = urlparse(url)
+    if parsed.path.rstrip("/").endswith("profile.php"):
+        return f"{url}&sk={suffix.strip('/')}"
+    return url.rstrip("/") + suffix
+
+# ==============================
+# INDEX
+# ==============================
+class ProfileIndex:
+    """Persistent map from canonical profile key to the roster rows using it.
+
+    Several roster rows often point at the same person through different
+    link spellings; the scrapers fetch each key once and `fan_out` copies
+    the result back to every reg_code. `alias` records that two keys are the
+    same profile (e.g. a profile.php?id= link that lands on a vanity URL).
+    """
+
+    def __init__(self, path=INDEX_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS rows (
+                key TEXT NOT NULL,
+                reg_code TEXT NOT NULL,
+                link TEXT,
+                PRIMARY KEY (key, reg_code)
+            );
+            CREATE TABLE IF NOT EXISTS aliases (
+                key TEXT PRIMARY KEY,
+                canonical TEXT NOT NULL
+            );
+        """)
+        # Aliases older runs recorded onto shared wall pages (facebook:checkpoint)
+        self.db.executemany("DELETE FROM aliases WHERE canonical = ?",
+                            [(f"facebook:{name}",) for name in FACEBOOK_RESERVED])
+        self.db.commit()
+
+    def add_roster(self, path, link_col, site, reg_col="reg_code", chunksize=10_000):
+        """Index every roster row with a profile link; returns (rows, distinct keys)"""
+        with self.lock:
+            for chunk in pd.read_csv(path, usecols=[reg_col, link_col], chunksize=chunksize, dtype=str):
+                batch = []
+                for reg_code, link in zip(chunk[reg_col], chunk[link_col]):
+                    key = profile_key(link, site)
+                    if key and isinstance(reg_code, str):
+                        batch.append((key, reg_code, link))
+                self.db.executemany("INSERT OR REPLACE INTO rows VALUES (?, ?, ?)", batch)
+            self.db.commit()
+            rows, keys = self.db.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT key) FROM rows WHERE key LIKE ?", (f"{site}:%",)).fetchone()
+        return rows, keys
+
+    def resolve(self, key):
+        with self.lock:
+            seen = {key}
+            while True:
+                row = self.db.execute("SELECT canonical FROM aliases WHERE key = ?", (key,)).fetchone()
+                if row is None or row[0] in seen:
+                    return key
+                key = row[0]
+                seen.add(key)
+
+    def alias(self, key, canonical):
+        if not key or not canonical or key == canonical:
+            return
+        with self.lock:
+            self.db.execute("INSERT OR REPLACE INTO aliases VALUES (?, ?)", (key, canonical))
+            self.db.commit()
+
+    def same_profile(self, key):
+        """`key`'s canonical key followed by every key aliased to it"""
+        canonical = self.resolve(key)
+        with self.lock:
+            return [canonical] + [k for (k,) in self.db.execute(
+                "SELECT key FROM aliases WHERE canonical = ?", (canonical,))]
+
+    def reg_codes(self, key):
+        """Roster rows for a key, including rows filed under any alias of it"""
+        keys = self.same_profile(key)
+        with self.lock:
+            marks = ",".join("?" * len(keys))
+            return sorted({r for (r,) in self.db.execute(
+                f"SELECT reg_code FROM rows WHERE key IN ({marks})", keys)})
+
+    def fan_out(self, records, link_col, site):
+        """One copy of each scraped record per roster row (with its reg_code)"""
+        for record in records:
+            key = profile_key(record.get(link_col), site)
+            codes = self.reg_codes(key) if key else []
+            for reg_code in codes or [""]:
+                yield {"reg_code": reg_code, **record}
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+if __name__ == "__main__":
+    import sys
+
+    # python canonical.py <roster.csv> <link column> <linkedin|facebook>
+    roster, column, site = sys.argv[1:4]
+    with ProfileIndex() as index:
+        rows, keys = index.add_roster(roster, column, site)
+    print(f"Indexed {rows} roster rows onto {keys} distinct {site} profiles in {os.path.abspath(INDEX_FILE)}")
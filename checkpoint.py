@@ -0,0 +1,76 @@
+import json
+import os
+import threading
+import pandas as pd
+
+WRITE_LOCK = threading.Lock()  # account worker threads share one checkpoint
+
+# ==============================
+# HELPERS
+# ==============================
+def has_data(record, key):
+    """True if any scraped field besides the key came back non-empty"""
+    return any(v for k, v in record.items() if k != key)
+
+def read_records(path):
+    """Yield records from a JSONL checkpoint, skipping a torn last line"""
+    if not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                print(f"⚠️ Skipping corrupt checkpoint line in {path}")
+
+# ==============================
+# CHECKPOINT
+# ==============================
+def load_done(path, key, normalize=None):
+    """Links that already have a successful result in the checkpoint.
+
+    `normalize` maps links written by older link formats onto today's form.
+    """
+    normalize = normalize or (lambda link: link)
+    return {normalize(r[key]) for r in read_records(path) if r.get(key) and has_data(r, key)}
+
+def append_result(path, record):
+    """Durably append one result so a crash never loses finished work"""
+    with WRITE_LOCK, open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+def compact(path, output_file, key, order=None, normalize=None, fan_out=None):
+    """Collapse the checkpoint into one row per link and write the CSV.
+
+    The newest successful result per link wins; failed attempts are kept
+    only when nothing better exists. Links are passed through `normalize`
+    first, rows follow `order` when given, and `fan_out` (records ->
+    records) can expand each profile into one row per roster entry.
+    """
+    latest = {}
+    for record in read_records(path):
+        link = record.get(key)
+        if normalize and link:
+            link = normalize(link)
+            record[key] = link
+        if not link:
+            continue
+        if has_data(record, key) or not has_data(latest.get(link, {}), key):
+            latest[link] = record
+
+    if order is not None:
+        rank = {link: i for i, link in enumerate(dict.fromkeys(order))}
+        links = sorted(latest, key=lambda link: rank.get(link, len(rank)))
+    else:
+        links = list(latest)
+
+    rows = [latest[link] for link in links]
+    if fan_out is not None:
+        rows = list(fan_out(rows))
+    pd.DataFrame(rows).to_csv(output_file, index=False)
+    return len(rows)
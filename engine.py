@@ -0,0 +1,442 @@
+import argparse
+import asyncio
+import importlib
+import os
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+from checkpoint import load_done, append_result, compact, has_data
+from session_pool import SessionPool
+from work_queue import WorkQueue, worker_id
+from roster import prioritized_links, iter_links
+from result_store import ResultStore, MERGED_FILE, HISTORY_FILE
+from verification import verify, VERIFIED_FILE
+from canonical import ProfileIndex, profile_key
+from page_cache import PageCache, reparse
+from http_fetch import make_session, http_first, fetch_profile_http
+from telemetry import TELEMETRY
+from pacing import RESTRICTION_SIGNALS
+from warm_start import start_chrome, probe_login, inject_cookies, storage_state
+from recycling import Recycler, driver_pid, children_rss_mb
+from resource_blocking import configure_chrome, enable_cdp_blocking, drain_selenium_stats, install_route_blocking
+
+# ==============================
+# CONFIG
+# ==============================
+# Site adapters: modules exposing SITE, LINK_COLUMN, SCORE_COLUMN, the usual
+# run constants (INPUT_FILE, PROFILES_PER_ACCOUNT, PER_HOUR_BUDGET...) and
+# normalize_link, login(driver, account), scrape_profile(url, driver, cache)
+# and scrape_profile_async(url, page, cache)
+SITES = {"linkedin": "scrape_Linkedin", "facebook": "scrape_facebook"}
+BACKENDS = ["selenium", "playwright"]
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36")
+
+def load_site(site):
+    """Adapter module for a site name (an adapter module passes through)"""
+    return importlib.import_module(SITES[site]) if isinstance(site, str) else site
+
+def override(site, **constants):
+    """Copy of a site adapter with some constants replaced, e.g. another
+    script's input/output files and pacing on top of scrape_Linkedin"""
+    base = load_site(site)
+    adapter = types.ModuleType(f"{base.__name__}+override")
+    adapter.__dict__.update({k: v for k, v in vars(base).items() if not k.startswith("__")})
+    adapter.__dict__.update(constants)
+    return adapter
+
+# ==============================
+# SELENIUM BACKEND
+# ==============================
+def new_driver(headless=False):
+    from selenium import webdriver
+
+    options = webdriver.ChromeOptions()
+    options.add_argument(f"user-agent={USER_AGENT}")
+    configure_chrome(options, headless=headless)
+    driver = start_chrome(options)
+    driver.set_window_size(1920, 1080)
+    enable_cdp_blocking(driver)
+    return driver
+
+def recycle_driver(driver, headless=False):
+    """Fresh Chrome carrying the old one's cookies, so no login is needed"""
+    state = storage_state(driver)
+    driver.quit()
+    driver = new_driver(headless)
+    inject_cookies(driver, state["cookies"])
+    return driver
+
+def selenium_account(site, account, pool, work, cache, index, store):
+    """Lease `site` links from the shared work queue with one account's own
+    Chrome until the queue drains, the per-run cap is hit or the account
+    gets quarantined"""
+    owner = worker_id(f"{site.SITE}/{account.name}")
+    driver = new_driver(site.HEADLESS)
+    session = make_session(cookies=account.cookies()) if site.HTTP_FIRST else None
+    scheduler = account.scheduler
+    recycler = Recycler(f"{site.SITE}/{account.name}", every=site.RECYCLE_EVERY, max_rss_mb=site.MAX_RSS_MB)
+    scraped = 0
+    try:
+        with TELEMETRY.phase("login", account=account.name, site=site.SITE):
+            site.login(driver, account)
+        print(f"\n🚀 [{site.SITE}/{account.name}] Starting")
+        while not pool.is_quarantined(account) and scraped < site.PROFILES_PER_ACCOUNT:
+            job = work.lease(site.SITE, owner, account.name)
+            if job is None:
+                break
+            job_id, url = job
+            drain_selenium_stats(driver)
+            with TELEMETRY.phase("profile", url):
+                data, via = http_first(url, session, site.SITE, site.LINK_COLUMN,
+                                       lambda: site.scrape_profile(url, driver, cache), cache)
+            current_url = driver.current_url if via == "browser" else url
+            if via == "browser":
+                print(drain_selenium_stats(driver).summary(url))
+            if record(site, account, pool, work, index, store, job_id, owner, url, current_url, data, via,
+                      "selenium"):
+                break
+            scraped += 1
+            if via == "browser" and recycler.due(driver_pid(driver)):
+                driver = recycle_driver(driver, site.HEADLESS)
+            scheduler.sleep(scheduler.next_delay(url))
+            if scraped % site.BATCH_SIZE == 0:
+                print(f"😴 [{site.SITE}/{account.name}] Cooling down between batches...")
+                scheduler.sleep(scheduler.cooldown(), phase="batch_cooldown")
+    finally:
+        driver.quit()
+        print(recycler.summary())
+    return scraped
+
+async def run_selenium(site, pool, work, cache, index, store, browser=None):
+    """One Chrome per healthy account, each in its own thread"""
+    accounts = pool.available()
+    if not accounts:
+        return
+    # Each account holds its thread for the whole run; the default executor
+    # (cpu+4 threads, shared with every to_thread call) would queue the rest
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=len(accounts), thread_name_prefix=f"{site.SITE}-selenium") as executor:
+        results = await asyncio.gather(
+            *(loop.run_in_executor(executor, selenium_account, site, a, pool, work, cache, index, store)
+              for a in accounts),
+            return_exceptions=True)
+    for account, result in zip(accounts, results):
+        if isinstance(result, BaseException):
+            print(f"❌ [{site.SITE}/{account.name}] Stopped: {result}")
+        else:
+            print(f"🏁 [{site.SITE}/{account.name}] Finished after {result} profiles")
+
+# ==============================
+# PLAYWRIGHT BACKEND
+# ==============================
+class AccountContext:
+    """One account's browser context, swapped for a fresh one when Chromium grows.
+
+    Playwright's pages share one browser process tree, so memory can only be
+    measured for the whole browser, and closing a single page never brings
+    it back under the ceiling. Once Chromium (not Python) passes
+    `max_rss_mb`, `renew()` opens a new context from the old one's storage
+    state; each worker moves its page over at its next profile, and the old
+    context closes with its last page.
+    """
+
+    def __init__(self, site, account, context, max_rss_mb):
+        self.site = site
+        self.account = account
+        self.context = context
+        self.pages = {context: 0}
+        self.recycler = Recycler(f"{site.SITE}/{account.name}", every=0, max_rss_mb=max_rss_mb,
+                                 what="context", measure=children_rss_mb)
+
+    async def new_page(self):
+        page = await self.context.new_page()
+        self.pages[self.context] += 1
+        return page, await install_route_blocking(page, self.site.SITE)
+
+    async def close_page(self, page):
+        context = page.context
+        await page.close()
+        self.pages[context] -= 1
+        if context is not self.context and not self.pages[context]:
+            del self.pages[context]
+            await context.close()
+            rss = children_rss_mb()
+            if rss is not None and self.recycler.max_rss_mb and rss > self.recycler.max_rss_mb:
+                print(f"⚠️ [{self.recycler.name}] Browser still at {rss:.0f} MB with a fresh context, "
+                      f"stopping RSS recycling (MAX_RSS_MB {self.recycler.max_rss_mb} is below its baseline)")
+                self.recycler.max_rss_mb = None
+
+    async def renew(self):
+        """Start a fresh context with the current cookies and storage"""
+        state = await self.context.storage_state()
+        context = await self.context.browser.new_context(storage_state=state)
+        old, self.context = self.context, context
+        self.pages[context] = 0
+        if not self.pages.get(old):
+            self.pages.pop(old, None)
+            await old.close()
+
+    async def page_for(self, page, stats):
+        """`page` unless the context was renewed since it was opened"""
+        if page.context is self.context:
+            return page, stats
+        await self.close_page(page)
+        return await self.new_page()
+
+    async def close(self):
+        """Persist refreshed cookies so the next run starts from them"""
+        os.makedirs(os.path.dirname(self.account.state_file), exist_ok=True)
+        await self.context.storage_state(path=self.account.state_file)
+        for context in list(self.pages):
+            await context.close()
+        print(self.recycler.summary())
+
+async def playwright_worker(site, n, work, slot, account, pool, counts, cache, session, index, store):
+    """Lease jobs from the shared work queue until it drains, the account's
+    cap is hit or it is quarantined"""
+    label = f"{site.SITE}/{account.name}/w{n}"
+    owner = worker_id(label)
+    page, stats = await slot.new_page()
+    scheduler = account.scheduler
+    # Count only: the page's share of Chromium's memory cannot be measured,
+    # that is the account context's job
+    recycler = Recycler(label, every=site.RECYCLE_EVERY, max_rss_mb=None, what="page")
+    try:
+        while not pool.is_quarantined(account) and counts[account.name] < site.PROFILES_PER_ACCOUNT:
+            job = await asyncio.to_thread(work.lease, site.SITE, owner, account.name)
+            if job is None:
+                return
+            job_id, url = job
+            counts[account.name] += 1
+            print(f"\n➡️ [{label}] [{counts[account.name]}] Scraping: {url}")
+            page, stats = await slot.page_for(page, stats)
+            with TELEMETRY.phase("profile", url):
+                fields = None
+                if session is not None:
+                    fields = await asyncio.to_thread(fetch_profile_http, session, url, site.SITE, cache)
+                if fields is not None:
+                    data = {site.LINK_COLUMN: url, **fields}
+                    current_url, via = url, "http"
+                else:
+                    stats.reset()
+                    data = await site.scrape_profile_async(url, page, cache)
+                    print(stats.summary(url))
+                    current_url, via = page.url, "browser"
+            if via == "browser":
+                if slot.recycler.due():
+                    await slot.renew()
+                elif recycler.due():
+                    # A new page gets a fresh renderer; cookies stay in the context
+                    await slot.close_page(page)
+                    page, stats = await slot.new_page()
+            if await asyncio.to_thread(record, site, account, pool, work, index, store, job_id, owner, url,
+                                       current_url, data, via, "playwright"):
+                return
+            await scheduler.sleep_async(scheduler.next_delay(url))
+            if counts[account.name] % site.BATCH_SIZE == 0:
+                await scheduler.sleep_async(scheduler.cooldown(), phase="batch_cooldown")
+    finally:
+        await slot.close_page(page)
+        print(recycler.summary())
+
+async def new_account_context(browser, site, account):
+    """Isolated context carrying one account's cookies or full storage state"""
+    if not await asyncio.to_thread(probe_login, site.SITE, account.cookies()):
+        print(f"⚠️ [{site.SITE}/{account.name}] Saved session failed the login probe, pages may hit the login wall")
+    if account.is_storage_state:
+        return await browser.new_context(storage_state=account.state_path)
+    context = await browser.new_context()
+    await context.add_cookies(account.cookies())
+    return context
+
+async def run_playwright(site, pool, work, cache, index, store, browser=None):
+    """`site.CONCURRENCY` pages per healthy account, all in the running event loop"""
+    slots, workers = [], []
+    counts = {}
+    for account in pool.available():
+        slot = AccountContext(site, account, await new_account_context(browser, site, account), site.MAX_RSS_MB)
+        slots.append(slot)
+        counts[account.name] = 0
+        session = (make_session(cookies=account.cookies(), pool_size=site.CONCURRENCY)
+                   if site.HTTP_FIRST else None)
+        workers += [
+            asyncio.create_task(playwright_worker(site, n, work, slot, account, pool, counts, cache,
+                                                  session, index, store))
+            for n in range(1, site.CONCURRENCY + 1)
+        ]
+    try:
+        await asyncio.gather(*workers)
+    finally:
+        for slot in slots:
+            await slot.close()
+
+# ==============================
+# SHARED STEPS
+# ==============================
+def record(site, account, pool, work, index, store, job_id, owner, url, current_url, data, via, engine):
+    """Checkpoint, store and settle one leased job; True once the account is quarantined"""
+    # Full experience/education rows go to the store, not the flat checkpoint
+    history = data.pop("history", None)
+    landed = (current_url or "").lower()
+    if via == "browser" and data["name"] and not any(signal in landed for signal in RESTRICTION_SIGNALS):
+        # e.g. profile.php?id= landing on a vanity URL: same person, one key.
+        # Checkpoint and login walls are shared by everyone, never an alias.
+        index.alias(profile_key(url, site.SITE), profile_key(current_url, site.SITE))
+    if pool.record(account, url, current_url, data["name"]):
+        # Hand the profile to a healthy account instead of saving a wall page
+        work.release(job_id, owner)
+        return True
+    append_result(site.CHECKPOINT_FILE, data)
+    TELEMETRY.profile(url, via, data["name"])
+    store.upsert(site.SITE, data, site.LINK_COLUMN, source=via, engine=engine)
+    if history:
+        store.put_history(site.SITE, url, history)
+    if has_data(data, site.LINK_COLUMN):
+        work.complete(job_id, owner)
+    else:
+        work.fail(job_id, owner, f"nothing extracted via {via}")
+    return False
+
+def plan_jobs(site, pool, work, index, store):
+    """Queue the best unscraped roster links plus overdue refreshes; returns the accounts to run"""
+    accounts = pool.available()
+    if not accounts:
+        print(f"❌ Every {site.SITE} account is quarantined, nothing to do.")
+        return []
+    rows, keys = index.add_roster(site.INPUT_FILE, site.LINK_COLUMN, site.SITE)
+    print(f"🔗 {rows} roster rows point at {keys} distinct {site.SITE} profiles")
+    # Profiles verification.py doubted go back in the queue
+    rescrape = store.rescrape_links(site.SITE)
+    done = load_done(site.CHECKPOINT_FILE, site.LINK_COLUMN, site.normalize_link) - rescrape
+    budget = site.PROFILES_PER_ACCOUNT * len(accounts)
+    # Links already in the shared queue (pending, dead, or done by another
+    # script's checkpoint) must not take up the budget for new ones
+    queued = work.links(site.SITE) - rescrape
+    urls = prioritized_links(site.INPUT_FILE, site.LINK_COLUMN, site.normalize_link, site.SCORE_COLUMN,
+                             site.MIN_SCORE, priority=site.PRIORITY, limit=budget, skip=done | queued)
+    # Budget the new profiles leave goes to the most overdue refreshes
+    stale = [link for link in store.stale_links(site.SITE, limit=budget - len(urls)) if link not in rescrape]
+    work.requeue(site.SITE, rescrape | set(stale), status="done")
+    new = work.enqueue(site.SITE, urls + stale)
+    print(f"Resuming {site.SITE}: {len(done)} already scraped, {len(stale)} due a refresh, "
+          f"{new} new jobs for {len(accounts)} account(s), queue {work.stats(site.SITE)}")
+    return accounts
+
+def roster_output(path, roster, rosters):
+    """`path` for a single roster; with several, one file per roster
+    (alumni_merged-onlytenfb.csv) so they do not overwrite each other"""
+    if len(rosters) == 1:
+        return path
+    stem, ext = os.path.splitext(path)
+    return f"{stem}-{os.path.splitext(os.path.basename(roster))[0]}{ext}"
+
+def compact_args(site, index):
+    """Roster order, link normalization and one row per roster entry for checkpoint.compact"""
+    return {"order": iter_links(site.INPUT_FILE, site.LINK_COLUMN, site.normalize_link),
+            "normalize": site.normalize_link,
+            "fan_out": lambda rows: index.fan_out(rows, site.LINK_COLUMN, site.SITE)}
+
+def reparse_sites(sites, store, allow_stale=False):
+    """--reparse: re-extract every site's cached pages and compact them like finish() does"""
+    with ProfileIndex() as index:
+        for site in map(load_site, sites):
+            index.add_roster(site.INPUT_FILE, site.LINK_COLUMN, site.SITE)
+            reparse(site.SITE, site.LINK_COLUMN, site.CHECKPOINT_FILE, site.OUTPUT_FILE, store=store,
+                    allow_stale=allow_stale, **compact_args(site, index))
+
+def finish(sites, index, store):
+    """Compact each site's checkpoint, then merge and verify each roster once"""
+    for site in sites:
+        n = compact(site.CHECKPOINT_FILE, site.OUTPUT_FILE, site.LINK_COLUMN, **compact_args(site, index))
+        print(f"💾 Saved {n} {site.SITE} results to {site.OUTPUT_FILE}")
+    rows = store.export_history()
+    if rows:
+        print(f"🧾 {rows} experience/education rows written to {HISTORY_FILE}")
+    rosters = list(dict.fromkeys(site.INPUT_FILE for site in sites))
+    for roster in rosters:
+        merged, verified_file = (roster_output(path, roster, rosters) for path in (MERGED_FILE, VERIFIED_FILE))
+        print(f"🗃️ {store.export_roster(roster, merged, index=index)} rows of {roster} merged into {merged}")
+        verified = verify(merged, verified_file, store)
+        for site in sites:
+            if site.INPUT_FILE == roster:
+                scored, low = verified[site.SITE]
+                print(f"🔎 {site.SITE}: {scored} scraped rows verified against the roster, {low} flagged for re-scrape")
+
+# ==============================
+# RUN
+# ==============================
+async def run(site_names, backend="selenium"):
+    """Scrape several sites in one process.
+
+    Every site keeps its own account pool and pacing; their workers share
+    one work queue, result store and profile index, and run side by side,
+    so one site's cooldowns are spent scraping the other.
+    """
+    sites = [load_site(name) for name in site_names]
+    TELEMETRY.start_run(f"{'+'.join(site.SITE for site in sites)}-{backend}")
+    index = ProfileIndex()
+    store = ResultStore()
+    work = WorkQueue()
+    cache = PageCache() if any(site.CACHE_PAGES for site in sites) else None
+    pools = {}
+    for site in sites:
+        pools[site.SITE] = SessionPool(site.SITE, base_delay=site.DELAY_BETWEEN_PROFILES,
+                                       per_hour=site.PER_HOUR_BUDGET, per_day=site.PER_DAY_BUDGET,
+                                       cooldown=site.BATCH_COOLDOWN)
+    active = [site for site in sites if plan_jobs(site, pools[site.SITE], work, index, store)]
+
+    def jobs(browser=None):
+        runner = run_playwright if backend == "playwright" else run_selenium
+        return asyncio.gather(*(runner(site, pools[site.SITE], work, cache if site.CACHE_PAGES else None,
+                                       index, store, browser) for site in active))
+
+    try:
+        if backend == "playwright":
+            from playwright.async_api import async_playwright
+
+            async with async_playwright() as p:
+                browser = await p.chromium.launch(headless=all(site.HEADLESS for site in active))
+                await jobs(browser)
+                await browser.close()
+        else:
+            await jobs()
+        for site in active:
+            for name, health in pools[site.SITE].summary().items():
+                print(f"👥 {name}: {health}")
+            pending = work.stats(site.SITE).get("pending", 0)
+            if pending and not pools[site.SITE].available():
+                print(f"⚠️ {pending} {site.SITE} profiles left unscraped: every account is quarantined")
+    finally:
+        if cache is not None:
+            cache.close()
+        work.close()
+
+    for line in TELEMETRY.summary():
+        print(line)
+    finish(sites, index, store)
+    store.close()
+    index.close()
+
+def main(argv=None, default_sites=tuple(SITES), default_backend="selenium"):
+    parser = argparse.ArgumentParser(description="Scrape LinkedIn and/or Facebook profiles for the roster")
+    # No `choices` here: argparse would check the default list itself against them
+    parser.add_argument("sites", nargs="*", default=None, help=f"any of {', '.join(SITES)}")
+    parser.add_argument("--backend", choices=BACKENDS, default=default_backend)
+    parser.add_argument("--reparse", action="store_true",
+                        help="re-extract fields from cached pages, no browser")
+    parser.add_argument("--stale", action="store_true",
+                        help="with --reparse, also read pages older than the cache TTL")
+    args = parser.parse_args(argv)
+    args.sites = args.sites or list(default_sites)
+    unknown = [name for name in args.sites if name not in SITES]
+    if unknown:
+        parser.error(f"unknown site(s) {', '.join(unknown)}; choose from {', '.join(SITES)}")
+    if args.reparse:
+        with ResultStore() as store:
+            reparse_sites(args.sites, store, allow_stale=args.stale)
+    else:
+        asyncio.run(run(args.sites, args.backend))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+from selector_registry import REGISTRY
+from telemetry import TELEMETRY
+
+# ==============================
+# CONFIG
+# ==============================
+ROOT_TIMEOUT = 10  # seconds to wait for the profile root, once per page
+
+# Per-site, per-page selector map. Every field holds an ordered chain of
+# specs; the first spec that yields non-empty text wins.
+#   css     - selector, evaluated inside the scope
+#   index   - which match to take (default 0)
+#   line    - take this line of the matched element's text
+#   section - restrict the scope to <section>s whose h2 contains this text
+#   item    - inside the scope, narrow to the first element matching this
+SELECTOR_MAP = {
+    "linkedin": {
+        "profile": {
+            "root": "main",
+            "fields": {
+                "name": [
+                    {"css": "h1.text-heading-xlarge"},
+                    {"css": "h1.top-card-layout__title"},
+                    {"css": "h1"},
+                ],
+                "job_title": [
+                    {"css": "div.text-body-medium.break-words"},
+                    {"css": "h2.top-card-layout__headline"},
+                ],
+                "company": [
+                    {"section": "Experience", "item": "li", "css": "span[aria-hidden='true']", "index": 1},
+                    {"section": "Experience", "item": "li", "css": "span.t-14.t-normal.t-black"},
+                    {"css": "div.pv-entity__company-summary-info h3 span:nth-child(2)"},
+                    {"css": "ul.pv-profile-section__section-info li h3 span.pv-entity__secondary-title"},
+                    {"css": "section#experience li div.pv-entity__summary-info h3"},
+                    {"css": "a[data-tracking-control-name='public_profile_topcard-current-company']"},
+                ],
+                "location": [
+                    {"css": "span.text-body-small.inline.t-black--light.break-words"},
+                    {"css": "div.top-card__subline-item"},
+                ],
+            },
+        },
+    },
+    "facebook": {
+        "profile": {
+            "root": "div[role='main']",
+            "fields": {
+                "name": [{"css": "h1"}, {"css": "#cover-name-root h3"}],
+            },
+        },
+        "about": {
+            "root": "div[role='main']",
+            "fields": {
+                "job_title": [{"css": "div[data-gt*='work']", "line": 0}],
+                "company": [{"css": "div[data-gt*='work']", "line": 1}],
+                "location": [{"css": "div[data-gt*='places']", "line": 0}],
+            },
+        },
+        "about_work_and_education": {
+            "root": "div[role='main']",
+            "fields": {
+                "job_title": [{"css": "div.x1yztbdb div.x1i10hfl span", "index": 0}],
+                "company": [{"css": "div.x1yztbdb div.x1i10hfl span", "index": 1}],
+            },
+        },
+        "about_places": {
+            "root": "div[role='main']",
+            "fields": {
+                "location": [{"css": "div.x1yztbdb div.x1i10hfl span", "index": 0}],
+            },
+        },
+    },
+}
+
+# Placeholder headings shown instead of a name on login walls
+JUNK_NAMES = {
+    "linkedin": ["join linkedin", "sign in"],
+    "facebook": ["facebook", "log in"],
+}
+
+# Runs in the page: resolves every field of a page spec in one round trip and
+# reports which chain index hit (-1 for none) so the registry can learn
+EXTRACT_JS = """
+(spec) => {
+    const text = (el) => ((el && (el.innerText || el.textContent)) || "").trim();
+    const scopes = (s) => {
+        let found = [document];
+        if (s.section) {
+            found = Array.from(document.querySelectorAll("section")).filter((sec) =>
+                Array.from(sec.querySelectorAll("h2")).some((h) => text(h).includes(s.section)));
+        }
+        if (s.item) {
+            found = found.map((sc) => sc.querySelector(s.item)).filter(Boolean);
+        }
+        return found;
+    };
+    const resolve = (s) => {
+        for (const scope of scopes(s)) {
+            const el = scope.querySelectorAll(s.css)[s.index || 0];
+            let value = text(el);
+            if (value && s.line !== undefined) {
+                value = (value.split("\\n")[s.line] || "").trim();
+            }
+            if (value) return value;
+        }
+        return "";
+    };
+    const values = {}, hits = {};
+    for (const [field, chain] of Object.entries(spec.fields)) {
+        values[field] = "";
+        hits[field] = -1;
+        for (let i = 0; i < chain.length; i++) {
+            const value = resolve(chain[i]);
+            if (value) { values[field] = value; hits[field] = i; break; }
+        }
+    }
+    return {values, hits};
+}
+"""
+
+# ==============================
+# HELPERS
+# ==============================
+def page_spec(site, page="profile", learn=True):
+    """Selector spec for a page; with `learn`, chains are ordered by the registry"""
+    spec = SELECTOR_MAP[site][page]
+    return REGISTRY.ordered(site, page, spec) if learn else spec
+
+def empty_fields(site, page="profile"):
+    return {field: "" for field in SELECTOR_MAP[site][page]["fields"]}
+
+def learned(site, page, spec, result):
+    """Feed an extraction's hit indices to the registry and return its values"""
+    if not result:
+        return empty_fields(site, page)
+    REGISTRY.record(site, page, spec, result["hits"])
+    return result["values"]
+
+def store_page(cache, link, site, page, html):
+    if cache is None or not link:
+        return
+    try:
+        cache.put(link, site, page, html)
+    except Exception as e:
+        print(f"⚠️ Could not cache {page} page of {link}: {e}")
+
+# ==============================
+# SELENIUM
+# ==============================
+def extract_with_selenium(driver, site, page="profile", timeout=ROOT_TIMEOUT, cache=None, link=None):
+    """Wait once for the page root, then pull every field in a single execute_script.
+
+    With a PageCache, the rendered HTML is stored under `link` for --reparse.
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    spec = page_spec(site, page)
+    if not any(spec["fields"].values()):
+        return empty_fields(site, page)  # every selector is known dead, don't wait
+    timed_out = False
+    try:
+        with TELEMETRY.phase("wait_root", link, page=page):
+            WebDriverWait(driver, timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, spec["root"]))
+            )
+    except Exception:
+        timed_out = True
+        print(f"⚠️ Profile root '{spec['root']}' not found on {driver.current_url}")
+    if cache is not None:
+        with TELEMETRY.phase("cache_page", link, page=page):
+            store_page(cache, link, site, page, driver.page_source)
+    try:
+        with TELEMETRY.phase("extract", link, page=page):
+            values = learned(site, page, spec, driver.execute_script(f"return ({EXTRACT_JS})(arguments[0]);", spec))
+    except Exception as e:
+        print(f"⚠️ Extraction failed on {driver.current_url}: {e}")
+        values = empty_fields(site, page)
+    TELEMETRY.fields(site, page, values, link, timed_out)
+    return values
+
+# ==============================
+# PLAYWRIGHT
+# ==============================
+async def extract_with_playwright(page_obj, site, page="profile", timeout=ROOT_TIMEOUT, cache=None, link=None):
+    """Async twin of extract_with_selenium using page.evaluate"""
+    spec = page_spec(site, page)
+    if not any(spec["fields"].values()):
+        return empty_fields(site, page)
+    timed_out = False
+    try:
+        with TELEMETRY.phase("wait_root", link, page=page):
+            await page_obj.wait_for_selector(spec["root"], state="attached", timeout=timeout * 1000)
+    except Exception:
+        timed_out = True
+        print(f"⚠️ Profile root '{spec['root']}' not found on {page_obj.url}")
+    if cache is not None:
+        with TELEMETRY.phase("cache_page", link, page=page):
+            store_page(cache, link, site, page, await page_obj.content())
+    try:
+        with TELEMETRY.phase("extract", link, page=page):
+            values = learned(site, page, spec, await page_obj.evaluate(EXTRACT_JS, spec))
+    except Exception as e:
+        print(f"⚠️ Extraction failed on {page_obj.url}: {e}")
+        values = empty_fields(site, page)
+    TELEMETRY.fields(site, page, values, link, timed_out)
+    return values
+
+# ==============================
+# PURE HTML (no browser)
+# ==============================
+BLOCK_TAGS = {"div", "p", "li", "ul", "section", "h1", "h2", "h3", "tr", "br"}
+SKIP_TAGS = {"script", "style", "noscript", "template"}
+
+def html_text(el):
+    """Approximate innerText: block elements and <br> start new lines"""
+    parts = []
+
+    def walk(node):
+        if not isinstance(node.tag, str) or node.tag in SKIP_TAGS:
+            return
+        if node.tag in BLOCK_TAGS:
+            parts.append("\n")
+        if node.text:
+            parts.append(node.text)
+        for child in node:
+            walk(child)
+            if child.tail:
+                parts.append(child.tail)
+        if node.tag in BLOCK_TAGS:
+            parts.append("\n")
+
+    walk(el)
+    lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+def extract_from_html(html, site, page="profile", learn=True):
+    """Same selector map as EXTRACT_JS, evaluated with lxml over saved HTML.
+
+    --reparse passes learn=False: it must try every selector and should not
+    skew the live hit statistics.
+    """
+    import lxml.html
+
+    spec = page_spec(site, page, learn)
+    doc = lxml.html.fromstring(html)
+
+    def scopes(s):
+        found = [doc]
+        if s.get("section"):
+            found = [sec for sec in doc.cssselect("section")
+                     if any(s["section"] in html_text(h) for h in sec.cssselect("h2"))]
+        if s.get("item"):
+            found = [m[0] for m in (sc.cssselect(s["item"]) for sc in found) if m]
+        return found
+
+    def resolve(s):
+        for scope in scopes(s):
+            matches = scope.cssselect(s["css"])
+            index = s.get("index", 0)
+            if index >= len(matches):
+                continue
+            value = html_text(matches[index])
+            if value and s.get("line") is not None:
+                lines = value.split("\n")
+                value = lines[s["line"]].strip() if s["line"] < len(lines) else ""
+            if value:
+                return value
+        return ""
+
+    values, hits = {}, {}
+    for field, chain in spec["fields"].items():
+        values[field], hits[field] = "", -1
+        for i, s in enumerate(chain):
+            value = resolve(s)
+            if value:
+                values[field], hits[field] = value, i
+                break
+    if not learn:
+        return values
+    return learned(site, page, spec, {"values": values, "hits": hits})
@@ -0,0 +1,199 @@
+import html
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse
+
+# ==============================
+# CONFIG
+# ==============================
+HOST = "127.0.0.1"
+PORT = 8765
+
+FIRST_NAMES = ["Utsob", "Nazrul", "Ibrahim", "Farhana", "Tanvir", "Sadia", "Rakib", "Nusrat", "Arif", "Jannat"]
+LAST_NAMES = ["Roy", "Islam", "Hossain", "Akter", "Rahman", "Chowdhury", "Khan", "Begum", "Sarker", "Das"]
+JOB_TITLES = ["Software Engineer", "Video Editor", "Lecturer", "Legal Associate", "Data Analyst", "Student"]
+COMPANIES = ["Dhaka International University", "Grameenphone", "BRAC Bank", "Pathao", "Daraz", "Robi Axiata"]
+LOCATIONS = ["Dhaka, Bangladesh", "Chittagong, Bangladesh", "Bogra District, Rajshahi, Bangladesh",
+             "Sylhet, Bangladesh", "Lagos State, Nigeria"]
+
+# ==============================
+# SYNTHETIC PROFILES
+# ==============================
+def synthetic_profile(site, slug, missing_rate=0.0, login_wall_rate=0.0, subpage_rate=0.5):
+    """Deterministic fake profile for a slug, plus how the server should render it.
+
+    `missing` fields are absent from every page. For Facebook, `subpage_fields`
+    are left off /about and only appear on their dedicated about_* tab, which
+    exercises the scraper's fallbacks.
+    """
+    rng = random.Random(f"{site}:{slug}")
+    fields = {
+        "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        "job_title": rng.choice(JOB_TITLES),
+        "company": rng.choice(COMPANIES),
+        "location": rng.choice(LOCATIONS),
+    }
+    missing = {f for f in ("job_title", "company", "location") if rng.random() < missing_rate}
+    login_wall = rng.random() < login_wall_rate
+    subpage_fields = set()
+    if rng.random() < subpage_rate:
+        subpage_fields.add("work")
+    if rng.random() < subpage_rate:
+        subpage_fields.add("places")
+    for f in missing:
+        fields[f] = ""
+    return {"fields": fields, "missing": missing, "login_wall": login_wall, "subpage_fields": subpage_fields}
+
+def expected_fields(site, slug, **rates):
+    """What a correct scraper should return for this slug"""
+    profile = synthetic_profile(site, slug, **rates)
+    if profile["login_wall"]:
+        return {"name": "", "job_title": "", "company": "", "location": ""}
+    return dict(profile["fields"])
+
+# ==============================
+# RENDERING
+# ==============================
+def page(title, body):
+    return (f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{html.escape(title)}</title>"
+            f"</head><body>{body}</body></html>")
+
+def padding(rng, n=40):
+    """Filler markup so pages have a realistic amount of DOM to walk"""
+    return "".join(f"<div class='x9f619 filler'><span>{rng.random():.6f}</span></div>" for _ in range(n))
+
+def render_linkedin(slug, profile):
+    f = profile["fields"]
+    esc = {k: html.escape(v) for k, v in f.items()}
+    rng = random.Random(slug)
+    experience = ""
+    if f["company"]:
+        experience = (
+            "<section><div id='experience'></div><h2>Experience</h2><ul><li>"
+            f"<span aria-hidden='true'>{esc['job_title'] or 'Member'}</span>"
+            f"<span aria-hidden='true'>{esc['company']}</span>"
+            "</li></ul></section>"
+        )
+    body = (
+        "<main>"
+        f"<section><h1 class='text-heading-xlarge'>{esc['name']}</h1>"
+        + (f"<div class='text-body-medium break-words'>{esc['job_title']}</div>" if f["job_title"] else "")
+        + (f"<span class='text-body-small inline t-black--light break-words'>{esc['location']}</span>" if f["location"] else "")
+        + "</section>"
+        + padding(rng)
+        + experience
+        + "</main>"
+    )
+    return page(f"{f['name']} | LinkedIn", body)
+
+def render_facebook(slug, tab, profile):
+    f = profile["fields"]
+    esc = {k: html.escape(v) for k, v in f.items()}
+    rng = random.Random(f"{slug}/{tab}")
+    work_lines = "<br>".join(v for v in (esc["job_title"], esc["company"]) if v)
+
+    if tab == "":
+        inner = f"<h1>{esc['name']}</h1>"
+    elif tab == "about":
+        inner = ""
+        if work_lines and "work" not in profile["subpage_fields"]:
+            inner += f"<div data-gt='{{\"tab\":\"work\"}}'><div>{work_lines}</div></div>"
+        if f["location"] and "places" not in profile["subpage_fields"]:
+            inner += f"<div data-gt='{{\"tab\":\"places\"}}'><div>{esc['location']}</div></div>"
+    elif tab == "about_work_and_education":
+        spans = "".join(f"<div class='x1i10hfl'><span>{v}</span></div>"
+                        for v in (esc["job_title"], esc["company"]) if v)
+        inner = f"<div class='x1yztbdb'>{spans}</div>" if spans else ""
+    elif tab == "about_places":
+        inner = (f"<div class='x1yztbdb'><div class='x1i10hfl'><span>{esc['location']}</span></div></div>"
+                 if f["location"] else "")
+    else:
+        return None
+    return page(f"{f['name']} | Facebook", f"<div role='main'>{inner}{padding(rng)}</div>")
+
+def render_login_wall(site):
+    if site == "linkedin":
+        return page("Sign Up | LinkedIn", "<main><h1>Join LinkedIn</h1><form><input id='session_key'></form></main>")
+    return page("Log in to Facebook", "<div role='main'><h1>Facebook</h1><form><input id='email'></form></div>")
+
+# ==============================
+# SERVER
+# ==============================
+class ProfileHandler(BaseHTTPRequestHandler):
+    """Routes:
+        /in/<slug>                       LinkedIn profile
+        /<slug>[/about|/about_work_and_education|/about_places]   Facebook
+        /authwall, /login.php            login walls the profiles redirect to
+    """
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_html(self, status, body, headers=None):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        cfg = self.server.config
+        delay = cfg["latency"] + random.uniform(0, cfg["jitter"])
+        if delay:
+            time.sleep(delay)
+
+        path = urlparse(self.path).path.rstrip("/")
+        parts = [p for p in path.split("/") if p]
+        rates = {k: cfg[k] for k in ("missing_rate", "login_wall_rate", "subpage_rate")}
+
+        if path == "/authwall":
+            return self.send_html(200, render_login_wall("linkedin"))
+        if path == "/login.php":
+            return self.send_html(200, render_login_wall("facebook"))
+
+        if len(parts) == 2 and parts[0] == "in":
+            profile = synthetic_profile("linkedin", parts[1], **rates)
+            if profile["login_wall"]:
+                return self.send_html(302, "", {"Location": "/authwall"})
+            return self.send_html(200, render_linkedin(parts[1], profile))
+
+        if 1 <= len(parts) <= 2:
+            profile = synthetic_profile("facebook", parts[0], **rates)
+            if profile["login_wall"]:
+                return self.send_html(302, "", {"Location": "/login.php"})
+            body = render_facebook(parts[0], parts[1] if len(parts) == 2 else "", profile)
+            if body is not None:
+                return self.send_html(200, body)
+
+        self.send_html(404, page("Not found", "<h1>Page not found</h1>"))
+
+def start_server(host=HOST, port=PORT, latency=0.0, jitter=0.0, missing_rate=0.0,
+                 login_wall_rate=0.0, subpage_rate=0.5):
+    """Start the fixture server on a daemon thread; returns (server, base_url)"""
+    server = ThreadingHTTPServer((host, port), ProfileHandler)
+    server.daemon_threads = True
+    server.config = {
+        "latency": latency,
+        "jitter": jitter,
+        "missing_rate": missing_rate,
+        "login_wall_rate": login_wall_rate,
+        "subpage_rate": subpage_rate,
+    }
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+# ==============================
+# RUN
+# ==============================
+if __name__ == "__main__":
+    server, base_url = start_server()
+    print(f"Serving synthetic profiles on {base_url} (e.g. {base_url}/in/demo, {base_url}/demo/about)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
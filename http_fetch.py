@@ -0,0 +1,128 @@
+import json
+from urllib.parse import urlparse, urlunparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from extraction import SELECTOR_MAP, JUNK_NAMES, extract_from_html, store_page
+from pacing import RESTRICTION_SIGNALS
+from canonical import subpage_url
+from telemetry import TELEMETRY
+
+# ==============================
+# CONFIG
+# ==============================
+HTTP_TIMEOUT = 15  # seconds per request
+POOL_SIZE = 8      # keep-alive connections per host
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36")
+
+# Host served to the HTTP tier; m.facebook.com renders without JavaScript
+HTTP_HOSTS = {"linkedin": "www.linkedin.com", "facebook": "m.facebook.com"}
+
+# Pages fetched over HTTP per site (the rest are left to the browser)
+HTTP_PAGES = {"linkedin": ["profile"], "facebook": ["profile", "about"]}
+
+# The HTTP result is only kept when these came back non-empty
+HTTP_REQUIRED_FIELDS = {
+    "linkedin": ["name", "job_title"],
+    "facebook": ["name", "job_title", "location"],
+}
+
+# Markup that only appears on sign-in / sign-up walls
+LOGIN_WALL_MARKERS = ["<title>sign up | linkedin", "<title>log in to facebook", "join now to see"]
+
+PAGE_SUFFIXES = {"profile": "", "about": "/about"}
+
+# ==============================
+# SESSION
+# ==============================
+def make_session(cookie_file="cookies.json", pool_size=POOL_SIZE, cookies=None):
+    """Pooled keep-alive session carrying the browser cookies (from `cookies` or the file)"""
+    session = requests.Session()
+    retry = Retry(total=2, backoff_factor=1, status_forcelist=[502, 503, 504], allowed_methods=["GET"])
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "User-Agent": USER_AGENT,
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.9",
+    })
+    if cookies is None:
+        try:
+            with open(cookie_file, "r") as f:
+                cookies = json.load(f)
+        except FileNotFoundError:
+            print(f"⚠️ {cookie_file} not found, HTTP tier will fetch logged out")
+            cookies = []
+    for cookie in cookies:
+        session.cookies.set(cookie["name"], cookie["value"],
+                            domain=cookie.get("domain"), path=cookie.get("path", "/"))
+    return session
+
+# ==============================
+# HELPERS
+# ==============================
+def http_url(url, site, page="profile"):
+    parsed = urlparse(url)
+    host = parsed.netloc
+    if (parsed.hostname or "").endswith(f"{site}.com"):
+        host = HTTP_HOSTS.get(site, host)
+    base = urlunparse((parsed.scheme or "https", host, parsed.path, "", parsed.query, ""))
+    return subpage_url(base, PAGE_SUFFIXES[page])
+
+def is_login_wall(final_url, html):
+    url = final_url.lower()
+    if any(signal in url for signal in RESTRICTION_SIGNALS):
+        return True
+    head = html[:200_000].lower()
+    return any(marker.lower() in head for marker in LOGIN_WALL_MARKERS)
+
+# ==============================
+# HTTP TIER
+# ==============================
+def fetch_profile_http(session, url, site, cache=None, timeout=HTTP_TIMEOUT):
+    """Try to scrape a profile with plain HTTP.
+
+    Returns the extracted fields, or None when the page is a login wall,
+    fails to load or lacks the required fields, meaning the caller should
+    escalate to the browser.
+    """
+    fields = {}
+    for page in HTTP_PAGES[site]:
+        if page not in SELECTOR_MAP[site]:
+            continue
+        try:
+            with TELEMETRY.phase("http_fetch", url, page=page):
+                response = session.get(http_url(url, site, page), timeout=timeout, allow_redirects=True)
+        except requests.RequestException as e:
+            print(f"↗️ HTTP fetch failed for {url} ({e}), escalating to browser")
+            return None
+        if response.status_code != 200 or is_login_wall(response.url, response.text):
+            print(f"↗️ HTTP got {response.status_code} / login wall for {url}, escalating to browser")
+            return None
+        store_page(cache, url, site, page, response.text)
+        with TELEMETRY.phase("parse_html", url, page=page):
+            found = extract_from_html(response.text, site, page)
+        for field, value in found.items():
+            if value and not fields.get(field):
+                fields[field] = value
+
+    if fields.get("name", "").lower() in JUNK_NAMES[site]:
+        return None
+    missing = [f for f in HTTP_REQUIRED_FIELDS[site] if not fields.get(f)]
+    if missing:
+        print(f"↗️ HTTP page for {url} lacks {', '.join(missing)}, escalating to browser")
+        return None
+    print(f"⚡ Scraped over HTTP: {url}")
+    return {"name": "", "job_title": "", "company": "", "location": "", **fields}
+
+def http_first(url, session, site, key, browser_scrape, cache=None):
+    """HTTP tier first, browser only when needed; returns (record, via)"""
+    if session is not None:
+        fields = fetch_profile_http(session, url, site, cache)
+        if fields is not None:
+            return {key: url, **fields}, "http"
+    return browser_scrape(), "browser"
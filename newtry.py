@@ -1,122 +1,43 @@
+import argparse
 import asyncio
-import pandas as pd
-import json
-import random
-import time
-from urllib.parse import urlparse
-from playwright.async_api import async_playwright
+
+import engine
+from result_store import ResultStore
 
 # ==============================
 # CONFIG
 # ==============================
 INPUT_FILE = "onlytwentyen.csv"        # Must have column "linkedin_Link"
 OUTPUT_FILE = "linkedin_cookie_scraped2.csv"
-COOKIE_FILE = "cookies.json"             # Your li_at cookie file
-BATCH_SIZE = 5                           # Profiles per run
-DELAY_BETWEEN = (5, 12)                  # Random delay in seconds
-
-# ==============================
-# HELPERS
-# ==============================
-def normalize_link(url: str) -> str:
-    """Normalize LinkedIn profile links to standard www.linkedin.com"""
-    if not isinstance(url, str) or "linkedin.com" not in url:
-        return None
-    parsed = urlparse(url)
-    path = parsed.path
-    return f"https://www.linkedin.com{path}".split("?")[0]
-
-async def load_cookies(context, cookie_file):
-    """Load cookies into the browser context"""
-    with open(cookie_file, "r") as f:
-        cookies = json.load(f)
-    await context.add_cookies(cookies)
-
-# ==============================
-# SCRAPER
-# ==============================
-async def scrape_profile(url, page):
-    try:
-        await page.goto(url, timeout=60000)
-        await page.wait_for_timeout(random.randint(3000, 6000))
-
-        name, job_title, company, location = "", "", "", ""
-
-        # Name
-        if await page.locator("h1").count():
-            name = await page.locator("h1").inner_text()
-
-        # Job title (headline under name)
-        if await page.locator("div.text-body-medium.break-words").count():
-            job_title = await page.locator("div.text-body-medium.break-words").inner_text()
-
-        # 🔹 Company (Experience section)
-        try:
-            exp_section = page.locator("section:has(h2:has-text('Experience'))")
-            await exp_section.wait_for(timeout=10000)
-
-            first_role = exp_section.locator("li").nth(0)
-
-            # The company is usually the SECOND visible span inside the role
-            spans = first_role.locator("span[aria-hidden='true']")
-            if await spans.count() >= 2:
-                company = await spans.nth(1).inner_text()
-            else:
-                # Fallback: search for company-specific classes
-                alt = first_role.locator("span.t-14.t-normal.t-black")
-                if await alt.count():
-                    company = await alt.nth(0).inner_text()
-        except:
-            company = ""
-        # Location
-        if await page.locator("span.text-body-small.inline.t-black--light.break-words").count():
-            location = await page.locator("span.text-body-small.inline.t-black--light.break-words").nth(0).inner_text()
-
-        return {
-            "Linkedin_Link": url,
-            "name": name.strip(),
-            "job_title": job_title.strip(),
-            "company": company.strip(),
-            "location": location.strip()
-        }
-
-    except Exception as e:
-        print(f"❌ Failed to scrape {url}: {e}")
-        return {"Linkedin_Link": url, "name": "", "job_title": "", "company": "", "location": ""}
-
-# ==============================
-# MAIN
-# ==============================
-async def main():
-    df = pd.read_csv(INPUT_FILE)
-    if "Linkedin_Link" not in df.columns:
-        raise ValueError("❌ Input CSV must have a column named 'Linkedin_Link'")
-
-    urls = df["Linkedin_Link"].dropna().apply(normalize_link).dropna().tolist()
-    results = []
-
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)  # headless=False to debug
-        context = await browser.new_context()
-
-        # Load your li_at cookie
-        await load_cookies(context, COOKIE_FILE)
-
-        page = await context.new_page()
-
-        for i, url in enumerate(urls, start=1):
-            print(f"\n➡️ [{i}/{len(urls)}] Scraping: {url}")
-            data = await scrape_profile(url, page)
-            results.append(data)
-
-            wait_time = random.randint(*DELAY_BETWEEN)
-            print(f"⏳ Waiting {wait_time} seconds...")
-            time.sleep(wait_time)
-
-        await browser.close()
-
-    pd.DataFrame(results).to_csv(OUTPUT_FILE, index=False)
-    print(f"\n✅ Done! Results saved to {OUTPUT_FILE}")
+CHECKPOINT_FILE = "linkedin_cookie_scraped2.jsonl"  # appended as each profile finishes
+BATCH_SIZE = 5                           # Profiles between batch cooldowns (per worker)
+DELAY_BETWEEN_PROFILES = (5, 12)         # Random delay in seconds (per worker)
+BATCH_COOLDOWN = 0                       # Playwright workers only pace per profile
+PER_HOUR_BUDGET = 40                     # Max profile visits per hour (per account)
+PER_DAY_BUDGET = 250                     # Max profile visits per day (per account)
+PROFILES_PER_ACCOUNT = PER_DAY_BUDGET    # No account can use more than its daily budget in one run
+CONCURRENCY = 3                          # Parallel pages per account pulling from the queue
+CACHE_PAGES = True                       # Keep raw HTML in page_cache/ for --reparse
+MIN_SCORE = 60                           # Skip roster matches with a lower LinkedIn_Score
+PRIORITY = ["LinkedIn_Score", "passing_year"]  # Highest first; the budget goes to these
+HEADLESS = False                         # True to run Chromium without a window
+RECYCLE_EVERY = 150                      # Rendered profiles per page before it is replaced
+MAX_RSS_MB = 1500                        # ...or once the browser's processes pass this
+HTTP_FIRST = True                        # Try a plain HTTP fetch before rendering
+
+# The LinkedIn adapter with only this script's files and pacing swapped in
+ADAPTER = engine.override("linkedin", **{k: v for k, v in globals().items() if k.isupper()})
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # `python engine.py linkedin --backend playwright` with this script's files
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reparse", action="store_true",
+                        help="re-extract fields from cached pages, no browser")
+    parser.add_argument("--stale", action="store_true",
+                        help="with --reparse, also read pages older than the cache TTL")
+    args = parser.parse_args()
+    if args.reparse:
+        with ResultStore() as store:
+            engine.reparse_sites([ADAPTER], store, allow_stale=args.stale)
+    else:
+        asyncio.run(engine.run([ADAPTER], "playwright"))
@@ -0,0 +1,198 @@
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from telemetry import TELEMETRY
+
+# ==============================
+# CONFIG
+# ==============================
+STATE_FILE = "pacing_state.sqlite"       # token buckets + backoff, shared by every process
+LEGACY_STATE_FILE = "pacing_state.json"  # read once to seed accounts it already knows
+LOG_FILE = "pacing_log.jsonl"            # one line per pacing decision
+BUSY_TIMEOUT = 30                        # seconds to wait for another process's write lock
+RESTRICTION_SIGNALS = ("checkpoint", "challenge", "login", "authwall", "twofactor")
+
+# Several accounts' schedulers append to LOG_FILE from worker threads
+FILE_LOCK = threading.Lock()
+
+# ==============================
+# TOKEN BUCKET
+# ==============================
+class TokenBucket:
+    """Refills `capacity` tokens evenly over `period` seconds"""
+
+    def __init__(self, capacity, period, tokens=None, updated=None):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = capacity if tokens is None else tokens
+        self.updated = time.time() if updated is None else updated
+
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, now):
+        """Take one token, returning how long to wait until it is really ours"""
+        self.refill(now)
+        wait = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+        self.tokens -= 1
+        return wait
+
+# ==============================
+# SCHEDULER
+# ==============================
+class PacingScheduler:
+    """Adaptive pacing shared by the scrapers.
+
+    Delays are the random `base_delay` scaled by a backoff factor, but never
+    shorter than the per-hour and per-day budgets allow. Restriction signals
+    (checkpoint/challenge/login URLs, pages without a name) double the
+    factor; every `healthy_streak` clean profiles shrink it again.
+
+    The buckets and factor live in one SQLite row per scheduler name, read
+    and written back inside a BEGIN IMMEDIATE transaction on every decision
+    (as WorkQueue does), so processes or hosts running the same account
+    draw on one budget instead of each getting a full one.
+    """
+
+    def __init__(self, name, base_delay=(30, 90), per_hour=40, per_day=250,
+                 cooldown=120, min_factor=0.5, max_factor=16.0, healthy_streak=10,
+                 state_file=STATE_FILE, log_file=LOG_FILE):
+        self.name = name
+        self.base_delay = base_delay
+        self.cooldown_seconds = cooldown
+        self.min_factor = min_factor
+        self.max_factor = max_factor
+        self.healthy_streak = healthy_streak
+        self.state_file = state_file
+        self.log_file = log_file
+        self.factor = 1.0
+        self.streak = 0
+        self.hourly = TokenBucket(per_hour, 3600)
+        self.daily = TokenBucket(per_day, 86400)
+
+        self.lock = threading.Lock()
+        self.db = None
+        if state_file:
+            # isolation_level=None: transactions are explicit BEGIN IMMEDIATE blocks
+            self.db = sqlite3.connect(state_file, timeout=BUSY_TIMEOUT, isolation_level=None,
+                                      check_same_thread=False)
+            self.db.execute(
+                """CREATE TABLE IF NOT EXISTS pacing (
+                       name TEXT PRIMARY KEY,
+                       factor REAL NOT NULL,
+                       streak INTEGER NOT NULL,
+                       hour_tokens REAL NOT NULL,
+                       hour_updated REAL NOT NULL,
+                       day_tokens REAL NOT NULL,
+                       day_updated REAL NOT NULL
+                   )"""
+            )
+            with self._shared():
+                pass
+
+    # ---------- persistence ----------
+    def _legacy_state(self):
+        try:
+            with open(LEGACY_STATE_FILE, "r") as f:
+                return json.load(f).get(self.name, {})
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    @contextmanager
+    def _shared(self):
+        """Load this scheduler's row, let the caller change it, write it back,
+        all in one transaction other processes wait for"""
+        if self.db is None:
+            yield
+            return
+        with self.lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.db.execute(
+                    "SELECT factor, streak, hour_tokens, hour_updated, day_tokens, day_updated "
+                    "FROM pacing WHERE name = ?", (self.name,)).fetchone()
+                if row is None:
+                    state = self._legacy_state()
+                    row = (state.get("factor", self.factor), state.get("streak", self.streak),
+                           state.get("hour_tokens", self.hourly.tokens), state.get("hour_updated", self.hourly.updated),
+                           state.get("day_tokens", self.daily.tokens), state.get("day_updated", self.daily.updated))
+                (self.factor, self.streak, self.hourly.tokens, self.hourly.updated,
+                 self.daily.tokens, self.daily.updated) = row
+                yield
+                self.db.execute("INSERT OR REPLACE INTO pacing VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                (self.name, self.factor, self.streak, self.hourly.tokens, self.hourly.updated,
+                                 self.daily.tokens, self.daily.updated))
+                self.db.execute("COMMIT")
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+
+    def _log(self, event, **fields):
+        if not self.log_file:
+            return
+        entry = {"ts": time.time(), "scheduler": self.name, "event": event,
+                 "factor": round(self.factor, 3), **fields}
+        with FILE_LOCK:
+            with open(self.log_file, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    # ---------- decisions ----------
+    def next_delay(self, url=None):
+        """Seconds to wait before the next profile request"""
+        with self._shared():
+            now = time.time()
+            jitter = random.uniform(*self.base_delay) * self.factor
+            budget_wait = max(self.hourly.reserve(now), self.daily.reserve(now))
+        delay = max(jitter, budget_wait)
+        self._log("delay", url=url, delay=round(delay, 1), jitter=round(jitter, 1),
+                  budget_wait=round(budget_wait, 1),
+                  hour_tokens=round(self.hourly.tokens, 2), day_tokens=round(self.daily.tokens, 2))
+        return delay
+
+    def cooldown(self):
+        """Seconds to rest between batches, scaled by the current backoff"""
+        delay = self.cooldown_seconds * self.factor
+        self._log("cooldown", delay=round(delay, 1))
+        return delay
+
+    def is_restricted(self, current_url="", name=None):
+        url = (current_url or "").lower()
+        return any(s in url for s in RESTRICTION_SIGNALS) or name == ""
+
+    def record(self, url, current_url="", name=None):
+        """Feed back the outcome of one profile visit; returns True if restricted"""
+        if self.is_restricted(current_url, name):
+            with self._shared():
+                self.factor = min(self.max_factor, self.factor * 2)
+                self.streak = 0
+            print(f"🐢 [{self.name}] Restriction signal on {url}, backing off (x{self.factor:.2f})")
+            self._log("backoff", url=url, current_url=current_url, name_found=bool(name))
+            return True
+
+        with self._shared():
+            self.streak += 1
+            speedup = self.streak >= self.healthy_streak and self.factor > self.min_factor
+            if speedup:
+                self.factor = max(self.min_factor, self.factor * 0.8)
+                self.streak = 0
+        if speedup:
+            print(f"🐇 [{self.name}] Healthy streak, speeding up (x{self.factor:.2f})")
+            self._log("speedup", url=url)
+        return False
+
+    def sleep(self, seconds, phase="pacing_delay"):
+        print(f"⏳ [{self.name}] Waiting {seconds:.0f} seconds...")
+        TELEMETRY.timed_sleep(phase, seconds)
+
+    async def sleep_async(self, seconds, phase="pacing_delay"):
+        import asyncio
+
+        print(f"⏳ [{self.name}] Waiting {seconds:.0f} seconds...")
+        with TELEMETRY.phase(phase, planned=round(seconds, 2)):
+            await asyncio.sleep(seconds)
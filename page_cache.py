@@ -0,0 +1,173 @@
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from checkpoint import append_result, compact
+from extraction import SELECTOR_MAP, JUNK_NAMES, extract_from_html
+
+# ==============================
+# CONFIG
+# ==============================
+CACHE_DIR = "page_cache"                 # gzip'd HTML + index.sqlite
+CACHE_TTL = 30 * 24 * 3600               # seconds before a page counts as stale
+CACHE_MAX_BYTES = 500 * 1024 * 1024      # compressed size cap, LRU evicted
+EVICT_EVERY = 100                        # puts between size checks
+
+# ==============================
+# CACHE
+# ==============================
+class PageCache:
+    """On-disk cache of fetched profile pages keyed by (normalized link, subpage).
+
+    Pages are stored gzip-compressed under CACHE_DIR with a small SQLite index
+    tracking size, store time and last access. The TTL only decides whether
+    `get` treats a page as fresh (--reparse reads fresh pages unless given
+    --stale), so stale pages stay on disk; pages are deleted only by LRU eviction
+    once the cache grows past `max_bytes`, checked every `evict_every` puts.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, ttl=CACHE_TTL, max_bytes=CACHE_MAX_BYTES, evict_every=EVICT_EVERY):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.evict_every = evict_every
+        self.puts = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        # Shared with asyncio.to_thread fetches, so guard it with a lock
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(os.path.join(cache_dir, "index.sqlite"), check_same_thread=False)
+        self.db.execute(
+            """CREATE TABLE IF NOT EXISTS pages (
+                   key TEXT PRIMARY KEY,
+                   link TEXT NOT NULL,
+                   site TEXT NOT NULL,
+                   page TEXT NOT NULL,
+                   path TEXT NOT NULL,
+                   size INTEGER NOT NULL,
+                   stored_at REAL NOT NULL,
+                   accessed_at REAL NOT NULL
+               )"""
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS pages_lru ON pages (accessed_at)")
+        self.db.commit()
+
+    @staticmethod
+    def make_key(link, site, page="profile"):
+        return hashlib.sha1(f"{site}|{page}|{link}".encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.html.gz")
+
+    def put(self, link, site, page, html):
+        if not link or not html:
+            return
+        key = self.make_key(link, site, page)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp, "wb", compresslevel=6) as f:
+            f.write(html.encode("utf-8"))
+        os.replace(tmp, path)
+
+        now = time.time()
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, link, site, page, path, os.path.getsize(path), now, now),
+            )
+            self.db.commit()
+            self.puts += 1
+            if self.puts % self.evict_every == 0:
+                self.evict()
+
+    def get(self, link, site, page="profile", allow_stale=False):
+        key = self.make_key(link, site, page)
+        with self.lock:
+            row = self.db.execute("SELECT path, stored_at FROM pages WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            path, stored_at = row
+            if not allow_stale and time.time() - stored_at > self.ttl:
+                return None
+            try:
+                with gzip.open(path, "rb") as f:
+                    html = f.read().decode("utf-8")
+            except OSError:
+                self._drop(key, path)
+                self.db.commit()
+                return None
+            self.db.execute("UPDATE pages SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self.db.commit()
+            return html
+
+    def links(self, site):
+        return [r[0] for r in self.db.execute("SELECT DISTINCT link FROM pages WHERE site = ? ORDER BY link", (site,))]
+
+    def _drop(self, key, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        self.db.execute("DELETE FROM pages WHERE key = ?", (key,))
+
+    def evict(self):
+        """Drop least recently used pages until under max_bytes"""
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total > self.max_bytes:
+            for key, path, size in self.db.execute("SELECT key, path, size FROM pages ORDER BY accessed_at").fetchall():
+                if total <= self.max_bytes:
+                    break
+                self._drop(key, path)
+                total -= size
+            self.db.commit()
+
+    def close(self):
+        with self.lock:
+            self.evict()
+            self.db.close()
+
+# ==============================
+# OFFLINE RE-PARSE
+# ==============================
+def reparse(site, key, checkpoint_file, output_file, cache=None, allow_stale=False, store=None,
+            order=None, normalize=None, fan_out=None):
+    """Re-run extraction over every cached page of `site` without a browser.
+
+    Only pages younger than the cache TTL are read unless `allow_stale`;
+    profiles with no such page are skipped. Results are appended to the checkpoint (so they win over older rows)
+    and compacted into `output_file` with checkpoint.compact's `order`,
+    `normalize` and `fan_out`; with a result_store.ResultStore they are
+    upserted there too.
+    """
+    cache = cache or PageCache()
+    links = cache.links(site)
+    print(f"♻️ Re-parsing {len(links)} cached {site} profiles{'' if allow_stale else ' (fresh pages only)'}...")
+    skipped = 0
+    for link in links:
+        fields, read = {}, False
+        for page in SELECTOR_MAP[site]:
+            html = cache.get(link, site, page, allow_stale=allow_stale)
+            if html is None:
+                continue
+            read = True
+            for field, value in extract_from_html(html, site, page, learn=False).items():
+                if value and not fields.get(field):
+                    fields[field] = value
+        if not read:
+            skipped += 1
+            continue
+        if fields.get("name", "").lower() in JUNK_NAMES[site]:
+            fields["name"] = ""
+        record = {key: link, "name": "", "job_title": "", "company": "", "location": ""}
+        record.update(fields)
+        append_result(checkpoint_file, record)
+        if store is not None:
+            store.upsert(site, record, key, source="reparse", engine="lxml")
+    if skipped:
+        print(f"⏭️ {skipped} profiles had only pages older than the cache TTL (use --stale to include them)")
+    n = compact(checkpoint_file, output_file, key, order=order, normalize=normalize, fan_out=fan_out)
+    print(f"✅ Re-parsed results saved to {output_file} ({n} rows)")
+    return n
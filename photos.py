@@ -0,0 +1,216 @@
+import argparse
+import asyncio
+import hashlib
+import mimetypes
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from http_fetch import USER_AGENT
+from roster import iter_roster
+
+# ==============================
+# CONFIG
+# ==============================
+INPUT_FILE = "onlytwentyen.csv"   # roster with image_url / reg_code columns
+PHOTO_DIR = "photos"              # blobs/<sha[:2]>/<sha>.<ext> + index.sqlite
+CONCURRENCY = 16                  # downloads in flight (and keep-alive connections)
+REFRESH_DAYS = 30                 # re-validate photos older than this with ETag/Last-Modified
+PHOTO_TIMEOUT = 20                # seconds per request
+CHUNK_BYTES = 64 * 1024           # streamed write size
+
+# ==============================
+# INDEX
+# ==============================
+class PhotoIndex:
+    """SQLite map of image_url -> content hash, plus the validators for re-fetching.
+
+    Many URLs can point at one blob: identical files (the default avatar)
+    are stored once under their SHA-256.
+    """
+
+    def __init__(self, photo_dir=PHOTO_DIR):
+        self.photo_dir = photo_dir
+        os.makedirs(os.path.join(photo_dir, "blobs"), exist_ok=True)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(os.path.join(photo_dir, "index.sqlite"), check_same_thread=False)
+        self.db.execute(
+            """CREATE TABLE IF NOT EXISTS photos (
+                   url TEXT PRIMARY KEY,
+                   reg_code TEXT,
+                   status TEXT NOT NULL,
+                   sha256 TEXT,
+                   path TEXT,
+                   size INTEGER,
+                   etag TEXT,
+                   last_modified TEXT,
+                   fetched_at REAL NOT NULL
+               )"""
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS photos_sha ON photos (sha256)")
+        self.db.commit()
+
+    def get(self, url):
+        with self.lock:
+            cursor = self.db.execute("SELECT * FROM photos WHERE url = ?", (url,))
+            row = cursor.fetchone()
+            return dict(zip([d[0] for d in cursor.description], row)) if row else None
+
+    def put(self, url, reg_code, status, sha256=None, path=None, size=None, etag=None, last_modified=None):
+        with self.lock:
+            self.db.execute("INSERT OR REPLACE INTO photos VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            (url, reg_code, status, sha256, path, size, etag, last_modified, time.time()))
+            self.db.commit()
+
+    def touch(self, url):
+        with self.lock:
+            self.db.execute("UPDATE photos SET fetched_at = ? WHERE url = ?", (time.time(), url))
+            self.db.commit()
+
+    def blob_path(self, sha256, ext):
+        return os.path.join(self.photo_dir, "blobs", sha256[:2], f"{sha256}{ext}")
+
+    def duplicates(self, top=5):
+        """Most shared blobs: (sha256, urls pointing at it, bytes each)"""
+        with self.lock:
+            return self.db.execute(
+                """SELECT sha256, COUNT(*), MAX(size) FROM photos WHERE sha256 IS NOT NULL
+                   GROUP BY sha256 HAVING COUNT(*) > 1 ORDER BY COUNT(*) DESC LIMIT ?""", (top,)).fetchall()
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+# ==============================
+# DOWNLOAD
+# ==============================
+def make_photo_session(pool_size=CONCURRENCY):
+    """Keep-alive session sized so every in-flight download reuses a connection"""
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504], allowed_methods=["GET"])
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT, "Accept": "image/*,*/*;q=0.8"})
+    return session
+
+def fetch_photo(session, index, url, reg_code, refresh_days=REFRESH_DAYS, timeout=PHOTO_TIMEOUT):
+    """Download one photo if needed; returns 'fresh', 'not_modified', 'new', 'dedup', 'missing' or 'error'"""
+    known = index.get(url)
+    have_blob = bool(known and known["path"] and os.path.exists(known["path"]))
+    settled = have_blob or (known and known["status"] == "missing")
+    if settled and time.time() - known["fetched_at"] < refresh_days * 86400:
+        return "fresh"
+
+    headers = {}
+    if have_blob:
+        if known["etag"]:
+            headers["If-None-Match"] = known["etag"]
+        if known["last_modified"]:
+            headers["If-Modified-Since"] = known["last_modified"]
+    try:
+        with session.get(url, headers=headers, timeout=timeout, stream=True) as response:
+            if response.status_code == 304:
+                index.touch(url)
+                return "not_modified"
+            if response.status_code == 404:
+                index.put(url, reg_code, "missing")
+                return "missing"
+            response.raise_for_status()
+
+            content_type = response.headers.get("Content-Type", "").split(";")[0].strip()
+            ext = mimetypes.guess_extension(content_type) or os.path.splitext(url.split("?")[0])[1] or ".bin"
+            ext = ".jpg" if ext in (".jpe", ".jpeg") else ext
+            tmp = os.path.join(index.photo_dir, f".{threading.get_ident()}.part")
+            digest, size = hashlib.sha256(), 0
+            with open(tmp, "wb") as f:
+                for chunk in response.iter_content(CHUNK_BYTES):
+                    digest.update(chunk)
+                    size += len(chunk)
+                    f.write(chunk)
+            etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+    except requests.RequestException as e:
+        print(f"⚠️ Photo download failed for {url}: {e}")
+        if not have_blob:
+            index.put(url, reg_code, "error")
+        return "error"
+
+    sha256 = digest.hexdigest()
+    path = index.blob_path(sha256, ext)
+    if os.path.exists(path):
+        os.remove(tmp)
+        status = "dedup"
+    else:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(tmp, path)
+        status = "new"
+    index.put(url, reg_code, "ok", sha256, path, size, etag, last_modified)
+    return status
+
+async def download_photos(roster_path=INPUT_FILE, photo_dir=PHOTO_DIR, concurrency=CONCURRENCY,
+                          refresh_days=REFRESH_DAYS, url_col="image_url", reg_col="reg_code"):
+    """Stream the roster's photo URLs through `concurrency` workers.
+
+    The roster is read in chunks and fed through a bounded queue, so
+    memory stays flat however many rows there are; each download streams
+    straight to disk. Returns a count per outcome.
+    """
+    index = PhotoIndex(photo_dir)
+    session = make_photo_session(concurrency)
+    # Our own threads: the default executor caps at cpu+4 and would quietly
+    # shrink `concurrency` on a small machine
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="photo")
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=concurrency * 4)
+    counts = {}
+
+    def normalize(url):
+        url = url.strip()
+        return url if url.startswith(("http://", "https://")) else None
+
+    async def worker():
+        while True:
+            job = await queue.get()
+            try:
+                if job is None:
+                    return
+                status = await loop.run_in_executor(executor, fetch_photo, session, index, *job, refresh_days)
+                counts[status] = counts.get(status, 0) + 1
+                done = sum(counts.values())
+                if done % 500 == 0:
+                    print(f"🖼️ {done} photos processed: {counts}")
+            finally:
+                queue.task_done()
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    try:
+        for url, row in iter_roster(roster_path, url_col, normalize, columns=(reg_col,)):
+            await queue.put((url, row.get(reg_col)))
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        executor.shutdown(wait=True)
+        session.close()
+        for sha256, n, size in index.duplicates():
+            print(f"🧬 {n} URLs share {sha256[:12]}… ({(n - 1) * (size or 0) / 1024:.0f} KB not stored twice)")
+        index.close()
+    return counts
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Download roster photos with dedupe and conditional re-fetch")
+    parser.add_argument("roster", nargs="?", default=INPUT_FILE)
+    parser.add_argument("--dir", default=PHOTO_DIR)
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    parser.add_argument("--refresh-days", type=float, default=REFRESH_DAYS,
+                        help="re-validate photos fetched longer ago than this (0 = all)")
+    args = parser.parse_args()
+
+    counts = asyncio.run(download_photos(args.roster, args.dir, args.concurrency, args.refresh_days))
+    print(f"✅ Photos done: {counts}")
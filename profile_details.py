@@ -0,0 +1,228 @@
+import asyncio
+import re
+import time
+
+from canonical import subpage_url
+from telemetry import TELEMETRY
+from university import is_diu
+
+# ==============================
+# CONFIG
+# ==============================
+DETAILS_PAGES = {
+    "experience": "/details/experience/",
+    "education": "/details/education/",
+}
+ITEM_CSS = "main section li.pvs-list__paged-list-item, main section li.artdeco-list__item"
+LOAD_MORE_CSS = "button.scaffold-finite-scroll__load-button"
+FIRST_ITEM_TIMEOUT = 10  # seconds to wait for the list to appear at all
+GROW_TIMEOUT = 3         # seconds a scroll gets to add items before it counts as stable
+STABLE_ROUNDS = 1        # scrolls in a row without new items that end the loop
+MAX_SCROLLS = 12         # hard cap per page
+POLL_SECONDS = 0.25
+
+EMPLOYMENT_TYPES = {"full-time", "part-time", "self-employed", "freelance", "contract", "internship",
+                    "apprenticeship", "seasonal", "trainee"}
+WORK_MODES = {"on-site", "hybrid", "remote"}
+
+# "Jan 2020 - Present · 3 yrs 2 mos", "2016 - 2020", "Mar 2023"
+MONTH = r"(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?"
+DATE = rf"(?:{MONTH}\s+)?\d{{4}}"
+DATE_RE = re.compile(rf"^(?P<start>{DATE})(?:\s*[-–]\s*(?P<end>{DATE}|Present))?(?:\s*·\s*(?P<duration>.+))?$")
+
+# Runs in the page: every top-level list item with its own visible lines,
+# plus the lines of items nested in it (roles grouped under one company)
+ITEMS_JS = """
+(css) => {
+    const all = Array.from(document.querySelectorAll(css));
+    const owner = (el) => el.parentElement ? el.parentElement.closest(css) : null;
+    const lines = (item) => {
+        const out = [];
+        for (const span of item.querySelectorAll("span[aria-hidden='true']")) {
+            if (span.closest(css) !== item || span.parentElement.closest("span[aria-hidden='true']")) continue;
+            const text = (span.innerText || span.textContent || "").trim();
+            if (text && text !== out[out.length - 1]) out.push(text);
+        }
+        return out;
+    };
+    return all.filter((li) => !owner(li)).map((li) => ({
+        lines: lines(li),
+        roles: all.filter((sub) => owner(sub) === li).map(lines),
+    }));
+}
+"""
+COUNT_JS = "(css) => document.querySelectorAll(css).length"
+SCROLL_JS = """
+(css) => {
+    window.scrollTo(0, document.body.scrollHeight);
+    const more = document.querySelector(css);
+    if (more && !more.disabled) more.click();
+}
+"""
+
+# ==============================
+# PARSING
+# ==============================
+def parse_dates(line):
+    """{'start', 'end', 'duration'} from a date line, or None if it is not one"""
+    match = DATE_RE.match(line.strip())
+    if not match:
+        return None
+    return {k: (v or "").strip() for k, v in match.groupdict().items()}
+
+def _split(line):
+    return [part.strip() for part in line.split("·") if part.strip()]
+
+def parse_role(lines, company="", employment_type=""):
+    """One position from its lines: title, then company/type, dates, location"""
+    role = {"title": lines[0] if lines else "", "company": company, "employment_type": employment_type,
+            "start": "", "end": "", "duration": "", "location": ""}
+    rest = lines[1:]
+    date_at = next((i for i, line in enumerate(rest) if parse_dates(line)), None)
+    for line in rest[:date_at if date_at is not None else 1]:
+        for part in _split(line):
+            if part.lower() in EMPLOYMENT_TYPES:
+                role["employment_type"] = part
+            elif not role["company"]:
+                role["company"] = part
+    if date_at is not None:
+        role.update(parse_dates(rest[date_at]))
+        after = rest[date_at + 1:date_at + 2]
+        if after and len(after[0]) <= 80:
+            parts = [p for p in _split(after[0]) if p.lower() not in WORK_MODES]
+            role["location"] = parts[0] if parts else ""
+    return role
+
+def parse_experience(items):
+    """Every position on /details/experience/, newest first as LinkedIn lists them"""
+    positions = []
+    for item in items:
+        lines = item.get("lines") or []
+        roles = [r for r in item.get("roles") or [] if r]
+        if not lines:
+            continue
+        if roles:
+            # Grouped: company, then "Full-time · 5 yrs", then one nested item per role
+            employment_type = next((p for line in lines[1:2] for p in _split(line)
+                                    if p.lower() in EMPLOYMENT_TYPES), "")
+            positions += [parse_role(role, lines[0], employment_type) for role in roles]
+        else:
+            positions.append(parse_role(lines))
+    return [{"kind": "experience", "position": i, **p} for i, p in enumerate(positions)]
+
+def parse_education(items):
+    """Every school on /details/education/; `is_diu` marks Dhaka International University"""
+    entries = []
+    for item in items:
+        lines = item.get("lines") or []
+        if not lines:
+            continue
+        entry = {"school": lines[0], "degree": "", "field": "", "start": "", "end": "", "duration": ""}
+        for line in lines[1:]:
+            dates = parse_dates(line)
+            if dates:
+                entry.update(dates)
+                break
+            if not entry["degree"]:
+                entry["degree"], _, entry["field"] = (part.strip() for part in line.partition(","))
+        entry["is_diu"] = is_diu(entry["school"])
+        entries.append(entry)
+    return [{"kind": "education", "position": i, **e} for i, e in enumerate(entries)]
+
+PARSERS = {"experience": parse_experience, "education": parse_education}
+
+# ==============================
+# SELENIUM
+# ==============================
+def wait_for_items(count, timeout=FIRST_ITEM_TIMEOUT, poll=POLL_SECONDS):
+    deadline = time.monotonic() + timeout
+    while True:
+        n = count()
+        if n or time.monotonic() >= deadline:
+            return n
+        time.sleep(poll)
+
+def scroll_until_stable(count, scroll, max_scrolls=MAX_SCROLLS, stable_rounds=STABLE_ROUNDS,
+                        grow_timeout=GROW_TIMEOUT, poll=POLL_SECONDS):
+    """Scroll until `stable_rounds` scrolls in a row add no list items.
+
+    Each scroll waits only as long as it takes new items to show up (at
+    most `grow_timeout`), so short lists cost one quick round instead of
+    fixed sleeps. Returns (items, scrolls).
+    """
+    seen, stable, scrolls = count(), 0, 0
+    while scrolls < max_scrolls and stable < stable_rounds:
+        scroll()
+        scrolls += 1
+        deadline = time.monotonic() + grow_timeout
+        n = count()
+        while n <= seen and time.monotonic() < deadline:
+            time.sleep(poll)
+            n = count()
+        stable = stable + 1 if n <= seen else 0
+        seen = max(seen, n)
+    return seen, scrolls
+
+def details_with_selenium(driver, url):
+    """Experience and education rows of one LinkedIn profile, one page load each"""
+    rows = []
+    for kind, suffix in DETAILS_PAGES.items():
+        try:
+            with TELEMETRY.phase("details_get", url, page=kind):
+                driver.get(subpage_url(url, suffix))
+            count = lambda: driver.execute_script(f"return ({COUNT_JS})(arguments[0]);", ITEM_CSS)
+            with TELEMETRY.phase("details_scroll", url, page=kind):
+                if wait_for_items(count):
+                    n, scrolls = scroll_until_stable(
+                        count, lambda: driver.execute_script(f"({SCROLL_JS})(arguments[0]);", LOAD_MORE_CSS))
+                    TELEMETRY.event("details", profile=url, page=kind, items=n, scrolls=scrolls)
+            items = driver.execute_script(f"return ({ITEMS_JS})(arguments[0]);", ITEM_CSS)
+            rows += PARSERS[kind](items or [])
+        except Exception as e:
+            print(f"⚠️ Could not read {kind} details of {url}: {e}")
+    return rows
+
+# ==============================
+# PLAYWRIGHT
+# ==============================
+async def wait_for_items_async(count, timeout=FIRST_ITEM_TIMEOUT, poll=POLL_SECONDS):
+    deadline = time.monotonic() + timeout
+    while True:
+        n = await count()
+        if n or time.monotonic() >= deadline:
+            return n
+        await asyncio.sleep(poll)
+
+async def scroll_until_stable_async(count, scroll, max_scrolls=MAX_SCROLLS, stable_rounds=STABLE_ROUNDS,
+                                   grow_timeout=GROW_TIMEOUT, poll=POLL_SECONDS):
+    """Async twin of scroll_until_stable"""
+    seen, stable, scrolls = await count(), 0, 0
+    while scrolls < max_scrolls and stable < stable_rounds:
+        await scroll()
+        scrolls += 1
+        deadline = time.monotonic() + grow_timeout
+        n = await count()
+        while n <= seen and time.monotonic() < deadline:
+            await asyncio.sleep(poll)
+            n = await count()
+        stable = stable + 1 if n <= seen else 0
+        seen = max(seen, n)
+    return seen, scrolls
+
+async def details_with_playwright(page, url):
+    """Async twin of details_with_selenium"""
+    rows = []
+    for kind, suffix in DETAILS_PAGES.items():
+        try:
+            with TELEMETRY.phase("details_get", url, page=kind):
+                await page.goto(subpage_url(url, suffix), timeout=60000)
+            count = lambda: page.evaluate(COUNT_JS, ITEM_CSS)
+            with TELEMETRY.phase("details_scroll", url, page=kind):
+                if await wait_for_items_async(count):
+                    n, scrolls = await scroll_until_stable_async(
+                        count, lambda: page.evaluate(SCROLL_JS, LOAD_MORE_CSS))
+                    TELEMETRY.event("details", profile=url, page=kind, items=n, scrolls=scrolls)
+            rows += PARSERS[kind](await page.evaluate(ITEMS_JS, ITEM_CSS) or [])
+        except Exception as e:
+            print(f"⚠️ Could not read {kind} details of {url}: {e}")
+    return rows
@@ -0,0 +1,137 @@
+import os
+import time
+
+try:
+    import psutil
+except ImportError:  # optional; Linux can still be measured through /proc
+    psutil = None
+
+# ==============================
+# CONFIG
+# ==============================
+RECYCLE_EVERY = 150      # profiles per driver / page before it is rebuilt
+MAX_RSS_MB = 1500        # rebuild early once the browser's process tree passes this
+SAMPLE_EVERY = 5         # profiles between RSS samples
+
+# ==============================
+# MEMORY
+# ==============================
+def _proc_tree(pid):
+    pids, stack = [], [pid]
+    while stack:
+        p = stack.pop()
+        pids.append(p)
+        try:
+            for tid in os.listdir(f"/proc/{p}/task"):
+                with open(f"/proc/{p}/task/{tid}/children") as f:
+                    stack.extend(int(c) for c in f.read().split())
+        except OSError:
+            continue
+    return pids
+
+def _proc_rss_kb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+def tree_rss_mb(pid=None):
+    """Resident memory of `pid` and all its descendants (Chrome's renderers,
+    GPU process, ...) in MB, or None when it cannot be measured here"""
+    pid = pid or os.getpid()
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            procs = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return None
+        total = 0
+        for proc in procs:
+            try:
+                total += proc.memory_info().rss
+            except psutil.Error:
+                continue
+        return total / 2**20
+    if os.path.isdir("/proc"):
+        return sum(_proc_rss_kb(p) for p in _proc_tree(pid)) / 1024
+    return None
+
+def children_rss_mb(pid=None):
+    """tree_rss_mb without `pid` itself: the browsers a process started
+    (Playwright's driver and Chromium), not the Python interpreter"""
+    pid = pid or os.getpid()
+    total = tree_rss_mb(pid)
+    if total is None:
+        return None
+    if psutil is not None:
+        try:
+            return total - psutil.Process(pid).memory_info().rss / 2**20
+        except psutil.Error:
+            return total
+    return total - _proc_rss_kb(pid) / 1024
+
+def driver_pid(driver):
+    """chromedriver's pid; Chrome and its renderers run underneath it"""
+    service = getattr(driver, "service", None)
+    process = getattr(service, "process", None)
+    return getattr(process, "pid", None)
+
+# ==============================
+# POLICY
+# ==============================
+class Recycler:
+    """Decides when a long-lived browser should be torn down and rebuilt.
+
+    Call `due(pid)` after every profile: it returns True every `every`
+    profiles, or as soon as a sampled RSS of the process tree under `pid`
+    passes `max_rss_mb`. Samples are kept so `summary()` can report memory
+    for the whole run.
+    """
+
+    def __init__(self, name, every=RECYCLE_EVERY, max_rss_mb=MAX_RSS_MB, sample_every=SAMPLE_EVERY,
+                 what="browser", measure=None):
+        self.name = name
+        self.what = what
+        # measure() -> MB overrides the process tree under `pid`
+        self.measure = measure
+        self.every = every
+        self.max_rss_mb = max_rss_mb
+        self.sample_every = sample_every
+        self.since_recycle = 0
+        self.profiles = 0
+        self.recycles = 0
+        self.samples = []  # (timestamp, profiles, rss_mb)
+
+    def sample(self, pid=None):
+        rss = self.measure() if self.measure is not None else tree_rss_mb(pid)
+        if rss is not None:
+            self.samples.append((time.time(), self.profiles, rss))
+        return rss
+
+    def due(self, pid=None):
+        self.profiles += 1
+        self.since_recycle += 1
+        reason = None
+        if self.every and self.since_recycle >= self.every:
+            reason = f"{self.since_recycle} profiles"
+        elif self.max_rss_mb and self.profiles % self.sample_every == 0:
+            rss = self.sample(pid)
+            if rss is not None and rss > self.max_rss_mb:
+                reason = f"RSS {rss:.0f} MB > {self.max_rss_mb} MB"
+        if reason:
+            self.recycles += 1
+            self.since_recycle = 0
+            print(f"♻️ [{self.name}] Recycling {self.what} after {reason}")
+            return True
+        return False
+
+    def summary(self):
+        if not self.samples:
+            return f"♻️ [{self.name}] {self.profiles} profiles, {self.recycles} recycles, RSS not sampled"
+        rss = [s[2] for s in self.samples]
+        return (f"♻️ [{self.name}] {self.profiles} profiles, {self.recycles} recycles, "
+                f"RSS last {rss[-1]:.0f} MB / peak {max(rss):.0f} MB over {len(rss)} samples")
@@ -0,0 +1,173 @@
+import json
+import re
+from collections import Counter
+from urllib.parse import urlparse
+
+# ==============================
+# CONFIG
+# ==============================
+BLOCK_RESOURCES = True
+
+# Resource types we never read. Stylesheets stay on: innerText depends on them.
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+
+# Trackers, ads and beacons (regex, matched against the full URL)
+BLOCKED_URL_PATTERNS = [
+    r"google-analytics\.com",
+    r"googletagmanager\.com",
+    r"doubleclick\.net",
+    r"px\.ads\.linkedin\.com",
+    r"linkedin\.com/li/track",
+    r"linkedin\.com/realtime/",
+    r"connect\.facebook\.net/.*/fbevents",
+    r"facebook\.com/tr[/?]",
+    r"bat\.bing\.com",
+    r"scorecardresearch\.com",
+]
+
+# Hosts each site actually needs; anything else is blocked (Playwright only).
+# None disables the allowlist for that site.
+ALLOWED_HOSTS = {
+    "linkedin": ["linkedin.com", "licdn.com", "127.0.0.1", "localhost"],
+    "facebook": ["facebook.com", "fbcdn.net", "127.0.0.1", "localhost"],
+}
+
+# Wildcards handed to CDP Network.setBlockedURLs for Selenium, which cannot
+# filter by resource type directly
+TYPE_URL_WILDCARDS = {
+    "image": ["*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.svg*", "*.ico*"],
+    "media": ["*.mp4*", "*.webm*", "*.m3u8*", "*.mp3*"],
+    "font": ["*.woff*", "*.woff2*", "*.ttf*", "*.otf*"],
+}
+TRACKER_URL_WILDCARDS = [
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*px.ads.linkedin.com*", "*linkedin.com/li/track*", "*connect.facebook.net*fbevents*",
+    "*facebook.com/tr/*", "*facebook.com/tr?*", "*bat.bing.com*", "*scorecardresearch.com*",
+]
+
+# Rough transfer size per blocked request, used to estimate bytes saved
+TYPICAL_BYTES = {"image": 40_000, "media": 500_000, "font": 30_000, "script": 60_000, "other": 5_000}
+
+BLOCKED_RE = re.compile("|".join(BLOCKED_URL_PATTERNS))
+
+# ==============================
+# STATS
+# ==============================
+class BlockStats:
+    """Per-profile counters: what was blocked and what was actually downloaded"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.blocked = Counter()
+        self.loaded_bytes = 0
+
+    def add_blocked(self, resource_type):
+        self.blocked[resource_type if resource_type in TYPICAL_BYTES else "other"] += 1
+
+    @property
+    def saved_bytes(self):
+        return sum(TYPICAL_BYTES[t] * n for t, n in self.blocked.items())
+
+    def summary(self, url=""):
+        kinds = ", ".join(f"{t}={n}" for t, n in self.blocked.most_common()) or "none"
+        return (f"🧹 {url} blocked {sum(self.blocked.values())} requests ({kinds}), "
+                f"~{self.saved_bytes / 1024:.0f} KB saved, {self.loaded_bytes / 1024:.0f} KB loaded")
+
+def host_allowed(url, site):
+    allowed = ALLOWED_HOSTS.get(site)
+    if not allowed:
+        return True
+    host = (urlparse(url).hostname or "").lower()
+    return any(host == h or host.endswith("." + h) for h in allowed)
+
+def should_block(url, resource_type, site):
+    if resource_type == "document":
+        return False
+    return (resource_type in BLOCKED_RESOURCE_TYPES
+            or bool(BLOCKED_RE.search(url))
+            or not host_allowed(url, site))
+
+# ==============================
+# PLAYWRIGHT
+# ==============================
+async def install_route_blocking(page, site):
+    """Route every request of `page` through the block rules; returns its BlockStats"""
+    stats = BlockStats()
+    if not BLOCK_RESOURCES:
+        return stats
+
+    async def handle(route):
+        request = route.request
+        if should_block(request.url, request.resource_type, site):
+            stats.add_blocked(request.resource_type)
+            await route.abort("blockedbyclient")
+        else:
+            await route.continue_()
+
+    def on_response(response):
+        try:
+            stats.loaded_bytes += int(response.headers.get("content-length", 0))
+        except ValueError:
+            pass
+
+    await page.route("**/*", handle)
+    page.on("response", on_response)
+    return stats
+
+# ==============================
+# SELENIUM
+# ==============================
+def configure_chrome(options, headless=False):
+    """Lean Chrome flags plus the logging needed to count blocked requests"""
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-background-networking")
+    options.add_argument("--disable-component-update")
+    options.add_argument("--no-default-browser-check")
+    options.add_argument("--mute-audio")
+    if BLOCK_RESOURCES and "image" in BLOCKED_RESOURCE_TYPES:
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return options
+
+def enable_cdp_blocking(driver):
+    """Block resource types (by extension) and trackers via CDP Network.setBlockedURLs.
+
+    CDP has no allowlist mode here, so ALLOWED_HOSTS is not enforced for Selenium.
+    """
+    if not BLOCK_RESOURCES:
+        return
+    patterns = list(TRACKER_URL_WILDCARDS)
+    for resource_type in BLOCKED_RESOURCE_TYPES:
+        patterns.extend(TYPE_URL_WILDCARDS.get(resource_type, []))
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    except Exception as e:
+        print(f"⚠️ CDP request blocking unavailable: {e}")
+
+def drain_selenium_stats(driver):
+    """Turn the performance log accumulated since the last call into BlockStats"""
+    stats = BlockStats()
+    try:
+        entries = driver.get_log("performance")
+    except Exception:
+        return stats
+
+    types = {}
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        method, params = message.get("method"), message.get("params", {})
+        if method == "Network.requestWillBeSent":
+            types[params.get("requestId")] = (params.get("type") or "other").lower()
+        elif method == "Network.loadingFinished":
+            stats.loaded_bytes += int(params.get("encodedDataLength") or 0)
+        elif method == "Network.loadingFailed" and params.get("blockedReason"):
+            stats.add_blocked(types.get(params.get("requestId"), "other"))
+    return stats
@@ -0,0 +1,357 @@
+import argparse
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from canonical import profile_key, key_url
+
+# ==============================
+# CONFIG
+# ==============================
+STORE_FILE = "results.sqlite"     # every scraped profile, both sites
+MERGED_FILE = "alumni_merged.csv"  # roster + scraped columns (.parquet also works)
+HISTORY_FILE = "linkedin_history.csv"  # one row per position / school from the details pages
+FIELDS = ["name", "job_title", "company", "location"]
+LINK_COLUMNS = {"linkedin": "Linkedin_Link", "facebook": "Facebook_Link"}
+EXPORT_CHUNK = 10_000             # roster rows merged per step
+LOOKUP_BATCH = 500                # keys per SQL IN (...) lookup
+MAX_RESCRAPES = 2                 # re-scrapes of a flagged profile before giving up
+REFRESH_DAYS = 60                 # a complete profile that never changes is re-scraped this often
+INCOMPLETE_DAYS = 7               # ...one missing a REQUIRED_FIELDS value sooner (x successful scrapes)
+REQUIRED_FIELDS = ["name", "company"]
+HISTORY_FIELDS = ["title", "company", "employment_type", "school", "degree", "field", "start", "end",
+                  "duration", "location", "is_diu"]
+
+# ==============================
+# STORE
+# ==============================
+class ResultStore:
+    """SQLite store of scraped profiles keyed by canonical profile key.
+
+    Upserts are field-level: an empty value never replaces a non-empty one,
+    so a failed or partial re-scrape cannot wipe out an older good result.
+    `scraped_at` is the last attempt, `updated_at` the last attempt that
+    returned anything, and `source`/`engine` say how that data was fetched.
+    `fingerprint` hashes the stored fields; `changes` counts how many of the
+    `successes` altered it, which `stale_links` uses to refresh volatile
+    profiles more often than static ones.
+    """
+
+    def __init__(self, path=STORE_FILE):
+        self.path = path
+        # Account worker threads upsert as they go
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        columns = ", ".join(f"{f} TEXT NOT NULL DEFAULT ''" for f in FIELDS)
+        self.db.execute(
+            f"""CREATE TABLE IF NOT EXISTS results (
+                    key TEXT PRIMARY KEY,
+                    site TEXT NOT NULL,
+                    link TEXT NOT NULL,
+                    source TEXT,
+                    engine TEXT,
+                    {columns},
+                    scraped_at REAL NOT NULL,
+                    updated_at REAL,
+                    fingerprint TEXT,
+                    successes INTEGER NOT NULL DEFAULT 0,
+                    changes INTEGER NOT NULL DEFAULT 0
+                )"""
+        )
+        # Stores created before refresh planning lack the last three columns
+        have = {row[1] for row in self.db.execute("PRAGMA table_info(results)")}
+        for column, decl in [("fingerprint", "TEXT"), ("successes", "INTEGER NOT NULL DEFAULT 0"),
+                             ("changes", "INTEGER NOT NULL DEFAULT 0")]:
+            if column not in have:
+                self.db.execute(f"ALTER TABLE results ADD COLUMN {column} {decl}")
+        self.db.execute("CREATE INDEX IF NOT EXISTS results_updated ON results (updated_at)")
+        # Profiles verification.py doubts; pending until the next non-empty upsert
+        self.db.execute(
+            """CREATE TABLE IF NOT EXISTS flags (
+                   key TEXT PRIMARY KEY,
+                   site TEXT NOT NULL,
+                   confidence REAL,
+                   reason TEXT NOT NULL,
+                   flagged_at REAL NOT NULL,
+                   attempts INTEGER NOT NULL DEFAULT 1,
+                   pending INTEGER NOT NULL DEFAULT 1
+               )"""
+        )
+        # Full experience / education rows (profile_details.py), replaced per kind
+        columns = ", ".join(f'"{f}" TEXT NOT NULL DEFAULT \'\'' for f in HISTORY_FIELDS)
+        self.db.execute(
+            f"""CREATE TABLE IF NOT EXISTS history (
+                    key TEXT NOT NULL,
+                    site TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    {columns},
+                    scraped_at REAL NOT NULL,
+                    PRIMARY KEY (key, kind, position)
+                )"""
+        )
+        self.db.commit()
+
+        got = ", ".join(f"excluded.{f} != ''" for f in FIELDS)
+        keep = ",\n".join(
+            f"{f} = CASE WHEN excluded.{f} != '' THEN excluded.{f} ELSE results.{f} END" for f in FIELDS)
+        self.upsert_sql = f"""
+            INSERT INTO results (key, site, link, source, engine, {", ".join(FIELDS)}, scraped_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, {", ".join("?" * len(FIELDS))}, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET
+                scraped_at = excluded.scraped_at,
+                source = CASE WHEN max({got}) THEN excluded.source ELSE results.source END,
+                engine = CASE WHEN max({got}) THEN excluded.engine ELSE results.engine END,
+                updated_at = CASE WHEN max({got}) THEN excluded.updated_at ELSE results.updated_at END,
+                {keep}
+        """
+
+    def upsert(self, site, record, link_col, source="browser", engine="", scraped_at=None, commit=True):
+        """Merge one scraped record; returns False if its link is not a profile"""
+        key = profile_key(record.get(link_col), site)
+        if key is None:
+            return False
+        now = scraped_at or time.time()
+        values = [(record.get(f) or "").strip() for f in FIELDS]
+        with self.lock:
+            self.db.execute(self.upsert_sql, (key, site, key_url(key), source, engine, *values, now,
+                                              now if any(values) else None))
+            if any(values):
+                self.db.execute("UPDATE flags SET pending = 0 WHERE key = ?", (key,))
+                # Fingerprint the merged row, so a partial re-scrape is not a change
+                stored = self.db.execute(f"SELECT {', '.join(FIELDS)} FROM results WHERE key = ?", (key,)).fetchone()
+                fingerprint = hashlib.sha1("\x1f".join(stored).encode("utf-8")).hexdigest()[:16]
+                self.db.execute(
+                    """UPDATE results SET successes = successes + 1,
+                           changes = changes + (fingerprint IS NOT NULL AND fingerprint != ?),
+                           fingerprint = ?
+                       WHERE key = ?""", (fingerprint, fingerprint, key))
+            if commit:
+                self.db.commit()
+        return True
+
+    def put_history(self, site, link, rows, scraped_at=None):
+        """Replace a profile's experience and/or education rows.
+
+        Only the kinds present in `rows` are replaced, so a details page
+        that failed to load keeps its previous rows.
+        """
+        key = profile_key(link, site)
+        if key is None or not rows:
+            return False
+        now = scraped_at or time.time()
+        quoted = ", ".join(f'"{f}"' for f in HISTORY_FIELDS)
+        values = [(key, site, row["kind"], row["position"], *(str(row.get(f) or "") for f in HISTORY_FIELDS), now)
+                  for row in rows]
+        with self.lock:
+            for kind in {row["kind"] for row in rows}:
+                self.db.execute("DELETE FROM history WHERE key = ? AND kind = ?", (key, kind))
+            self.db.executemany(
+                f"INSERT INTO history (key, site, kind, position, {quoted}, scraped_at) "
+                f"VALUES (?, ?, ?, ?, {', '.join('?' * len(HISTORY_FIELDS))}, ?)", values)
+            self.db.commit()
+        return True
+
+    def export_history(self, output_file=HISTORY_FILE, chunksize=EXPORT_CHUNK):
+        """Stream every history row, with its profile link, to CSV; returns rows written"""
+        written = 0
+        tmp = f"{output_file}.tmp"
+        with self.lock:
+            chunks = pd.read_sql_query(
+                "SELECT key, site, kind, position, {} FROM history ORDER BY key, kind, position".format(
+                    ", ".join(f'"{f}"' for f in HISTORY_FIELDS)), self.db, chunksize=chunksize)
+            for i, chunk in enumerate(chunks):
+                chunk.insert(0, "link", chunk.pop("key").map(key_url))
+                chunk.to_csv(tmp, mode="w" if i == 0 else "a", header=i == 0, index=False)
+                written += len(chunk)
+        if not os.path.exists(tmp):
+            return 0
+        os.replace(tmp, output_file)
+        return written
+
+    def backfill(self, checkpoint_file, site, link_col=None):
+        """Load an existing JSONL checkpoint (oldest line first); returns rows read"""
+        from checkpoint import read_records
+
+        link_col = link_col or LINK_COLUMNS[site]
+        n = 0
+        for n, record in enumerate(read_records(checkpoint_file), 1):
+            self.upsert(site, record, link_col, source="checkpoint", commit=False)
+        with self.lock:
+            self.db.commit()
+        return n
+
+    def flag(self, rows):
+        """Mark profiles for re-scrape; rows are (key, site, confidence, reason).
+
+        Re-flagging a profile that was re-scraped since counts another attempt.
+        """
+        now = time.time()
+        with self.lock:
+            self.db.executemany(
+                """INSERT INTO flags (key, site, confidence, reason, flagged_at) VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT(key) DO UPDATE SET
+                       confidence = excluded.confidence,
+                       reason = excluded.reason,
+                       flagged_at = excluded.flagged_at,
+                       attempts = attempts + (1 - pending),
+                       pending = 1""",
+                [(*row, now) for row in rows if row[0]])
+            self.db.commit()
+
+    def rescrape_links(self, site, max_attempts=MAX_RESCRAPES):
+        """Canonical links of flagged profiles, to take out of a run's `done` set.
+
+        A profile still doubted after `max_attempts` re-scrapes is probably
+        the wrong person rather than a bad page, so it is left alone.
+        """
+        with self.lock:
+            return {key_url(key) for (key,) in self.db.execute(
+                "SELECT key FROM flags WHERE site = ? AND pending = 1 AND attempts <= ?", (site, max_attempts))}
+
+    def stale_links(self, site, limit=None, refresh_days=REFRESH_DAYS, incomplete_days=INCOMPLETE_DAYS,
+                    now=None):
+        """Canonical links worth re-scraping, most overdue first.
+
+        A profile is due `refresh_days` after its last attempt, divided by
+        (1 + its change rate) so ones that keep changing come round sooner.
+        Profiles with an empty REQUIRED_FIELDS value (or no data at all) are
+        due after `incomplete_days` per successful scrape, backing off for
+        profiles that simply have no company listed. Links are ordered by
+        how far past due they are.
+        """
+        now = now or time.time()
+        incomplete = " OR ".join(["updated_at IS NULL"] + [f"{f} = ''" for f in REQUIRED_FIELDS])
+        sql = f"""
+            SELECT key, (? - scraped_at) / 86400.0 / CASE
+                       WHEN {incomplete} THEN ? * MAX(successes, 1)
+                       ELSE ? / (1.0 + CAST(changes AS REAL) / MAX(successes - 1, 1))
+                   END AS overdue
+            FROM results WHERE site = ? AND overdue >= 1
+            ORDER BY overdue DESC, scraped_at"""
+        params = [now, incomplete_days, refresh_days, site]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(max(0, limit))
+        with self.lock:
+            return [key_url(key) for key, _ in self.db.execute(sql, params)]
+
+    def lookup(self, keys):
+        """{key: row dict} for the keys that have a stored result"""
+        keys = list(dict.fromkeys(k for k in keys if k))
+        found = {}
+        with self.lock:
+            for start in range(0, len(keys), LOOKUP_BATCH):
+                batch = keys[start:start + LOOKUP_BATCH]
+                cursor = self.db.execute(
+                    f"SELECT * FROM results WHERE key IN ({','.join('?' * len(batch))})", batch)
+                names = [d[0] for d in cursor.description]
+                for row in cursor:
+                    found[row[0]] = dict(zip(names, row))
+        return found
+
+    def counts(self):
+        with self.lock:
+            return dict(self.db.execute("SELECT site, COUNT(*) FROM results GROUP BY site").fetchall())
+
+    # ---------- export ----------
+    def merged_chunks(self, roster_path, chunksize=EXPORT_CHUNK, since=None, index=None):
+        """Roster chunks with <site>_<field> columns appended for both sites.
+
+        With `since`, only rows whose LinkedIn or Facebook result changed
+        after that timestamp are kept. `index` (a canonical.ProfileIndex)
+        finds results stored under any alias, e.g. a numeric Facebook id
+        that landed on a vanity URL.
+        """
+        for chunk in pd.read_csv(roster_path, chunksize=chunksize, dtype=str):
+            fresh = pd.Series(since is None, index=chunk.index)
+            for site, link_col in LINK_COLUMNS.items():
+                links = chunk[link_col] if link_col in chunk.columns else pd.Series("", index=chunk.index)
+                keys = [profile_key(link, site) for link in links]
+                # upsert() files a result under the link that was requested, so
+                # an aliased profile may sit under any of its keys; the newest wins
+                candidates = [index.same_profile(k) if k and index is not None else [k] for k in keys]
+                found = self.lookup([k for group in candidates for k in group])
+                rows = [max((found[k] for k in group if k in found),
+                            key=lambda row: row.get("updated_at") or 0, default={})
+                        for group in candidates]
+                for column in FIELDS + ["source", "updated_at"]:
+                    chunk[f"{site}_{column}"] = [row.get(column) for row in rows]
+                if since is not None:
+                    fresh |= pd.Series([bool(row.get("updated_at")) and row["updated_at"] > since
+                                        for row in rows], index=chunk.index)
+            yield chunk[fresh]
+
+    def export_roster(self, roster_path, output_file=MERGED_FILE, since=None, index=None):
+        """Stream the roster merge to CSV or Parquet; returns rows written"""
+        written = 0
+        tmp = f"{output_file}.tmp"
+        if output_file.endswith(".parquet"):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            writer = None
+            for chunk in self.merged_chunks(roster_path, since=since, index=index):
+                chunk = chunk.astype("string")
+                if writer is None:
+                    schema = pa.schema([(c, pa.string()) for c in chunk.columns])
+                    writer = pq.ParquetWriter(tmp, schema)
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+                written += len(chunk)
+            if writer is None:
+                return 0
+            writer.close()
+        else:
+            for i, chunk in enumerate(self.merged_chunks(roster_path, since=since, index=index)):
+                chunk.to_csv(tmp, mode="w" if i == 0 else "a", header=i == 0, index=False)
+                written += len(chunk)
+        if not os.path.exists(tmp):
+            return 0
+        os.replace(tmp, output_file)
+        return written
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# ==============================
+# CLI
+# ==============================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge stored LinkedIn/Facebook results onto the roster")
+    parser.add_argument("roster", nargs="?", default="onlytwentyen.csv", help="roster CSV")
+    parser.add_argument("output", nargs="?", default=MERGED_FILE, help=".csv or .parquet")
+    parser.add_argument("--since", type=float, help="only rows updated after this Unix timestamp")
+    parser.add_argument("--history", nargs="?", const=HISTORY_FILE,
+                        help=f"also write experience/education rows (default {HISTORY_FILE})")
+    parser.add_argument("--stale", choices=list(LINK_COLUMNS), help="list the profiles due for a refresh and exit")
+    parser.add_argument("--backfill", nargs=2, action="append", default=[], metavar=("SITE", "JSONL"),
+                        help="first load an existing checkpoint, e.g. --backfill linkedin linkedin_profilesss.jsonl")
+    args = parser.parse_args()
+
+    from canonical import ProfileIndex, INDEX_FILE
+
+    index = ProfileIndex() if os.path.exists(INDEX_FILE) else None
+    with ResultStore() as store:
+        if args.stale:
+            for link in store.stale_links(args.stale):
+                print(link)
+            raise SystemExit
+        for site, checkpoint_file in args.backfill:
+            print(f"📥 {store.backfill(checkpoint_file, site)} {site} records loaded from {checkpoint_file}")
+        n = store.export_roster(args.roster, args.output, since=args.since, index=index)
+        print(f"✅ {n} roster rows written to {args.output} ({store.counts()} stored profiles)")
+        if args.history:
+            print(f"🧾 {store.export_history(args.history)} experience/education rows written to {args.history}")
+    if index is not None:
+        index.close()
@@ -0,0 +1,71 @@
+import heapq
+
+import pandas as pd
+
+# ==============================
+# CONFIG
+# ==============================
+CHUNK_SIZE = 10_000  # roster rows held in memory at once
+
+# ==============================
+# HELPERS
+# ==============================
+def _number(value):
+    """Numeric sort key for a roster cell; blanks and junk sort last"""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return float("-inf")
+    return float("-inf") if value != value else value
+
+def iter_roster(path, link_col, normalize, score_col=None, min_score=None,
+                columns=(), chunksize=CHUNK_SIZE):
+    """Stream (link, row) pairs from a roster CSV in file order.
+
+    Only `link_col`, `score_col` and `columns` are parsed, one chunk at a
+    time. Links are normalized and deduplicated (first row wins); rows below
+    `min_score` are skipped.
+    """
+    wanted = [link_col] + [c for c in (score_col, *columns) if c and c != link_col]
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = [c for c in dict.fromkeys(wanted) if c in header]
+    if link_col not in usecols:
+        raise ValueError(f"❌ Input CSV must have a column named '{link_col}'")
+
+    seen = set()
+    for chunk in pd.read_csv(path, usecols=usecols, chunksize=chunksize, dtype=str):
+        for row in chunk.to_dict("records"):
+            link = normalize(row[link_col]) if isinstance(row[link_col], str) else None
+            if not link or link in seen:
+                continue
+            seen.add(link)
+            if min_score is not None and score_col and _number(row.get(score_col)) < min_score:
+                continue
+            yield link, row
+
+def iter_links(path, link_col, normalize, chunksize=CHUNK_SIZE):
+    """Every normalized roster link in file order (for ordering the output CSV)"""
+    for link, _ in iter_roster(path, link_col, normalize, chunksize=chunksize):
+        yield link
+
+def prioritized_links(path, link_col, normalize, score_col=None, min_score=None,
+                      priority=(), limit=None, skip=(), chunksize=CHUNK_SIZE):
+    """The best `limit` roster links not in `skip`, best first.
+
+    Rows are ranked by the `priority` columns (highest value first, e.g.
+    score then passing_year), ties keep file order. A bounded heap keeps
+    memory at O(limit) however long the roster is.
+    """
+    if limit is not None and limit <= 0:
+        return []
+    heap = []
+    for position, (link, row) in enumerate(iter_roster(path, link_col, normalize, score_col, min_score,
+                                                        priority, chunksize)):
+        if link in skip:
+            continue
+        item = (tuple(_number(row.get(col)) for col in priority), -position, link)
+        if limit is None or len(heap) < limit:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+    return [link for _, _, link in sorted(heap, reverse=True)]
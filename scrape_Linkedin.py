@@ -1,18 +1,17 @@
-import pandas as pd
 import random
-import time
-import json
-from urllib.parse import urlparse
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from dotenv import load_dotenv
 import os
+from extraction import extract_with_selenium, extract_with_playwright
+from canonical import canonical_url
+from profile_details import details_with_selenium, details_with_playwright
+from telemetry import TELEMETRY
+from warm_start import probe_login, inject_cookies, storage_state, save_state
 
 # Load environment variables
+try:
+    from dotenv import load_dotenv
+except ImportError:  # optional; credentials can come straight from the environment
+    load_dotenv = lambda: None
+
 load_dotenv()
 EMAIL = os.getenv("LINKEDIN_EMAIL")
 PASSWORD = os.getenv("LINKEDIN_PASSWORD")
@@ -20,38 +19,68 @@ PASSWORD = os.getenv("LINKEDIN_PASSWORD")
 # ==============================
 # CONFIG
 # ==============================
+SITE = "linkedin"  # site adapter for engine.py
+LINK_COLUMN = "Linkedin_Link"
+SCORE_COLUMN = "LinkedIn_Score"
 INPUT_FILE = "onlytwentyen.csv"  # must have column "Linkedin_Link"
 OUTPUT_FILE = "linkedin_profilesss.csv"
-BATCH_SIZE = 5  # profiles per run
-DELAY_BETWEEN_PROFILES = (30, 90)  # seconds (min, max)
+CHECKPOINT_FILE = "linkedin_profilesss.jsonl"  # one JSON result per line, appended as scraped
+BATCH_SIZE = 5  # profiles per batch, per account
+PROFILES_PER_ACCOUNT = 20  # leases per account per run
+MIN_SCORE = 60  # skip roster matches with a lower LinkedIn_Score
+PRIORITY = ["LinkedIn_Score", "passing_year"]  # highest first; the budget goes to these
+DELAY_BETWEEN_PROFILES = (30, 90)  # seconds (min, max), scaled by backoff
+BATCH_COOLDOWN = 120  # seconds between batches, scaled by backoff
+PER_HOUR_BUDGET = 40  # max profile visits per hour, per account
+PER_DAY_BUDGET = 250  # max profile visits per day, per account
+CACHE_PAGES = True  # keep raw HTML in page_cache/ for --reparse
+HEADLESS = False  # True to run Chrome without a window
+RECYCLE_EVERY = 150  # restart Chrome (keeping cookies) after this many rendered profiles
+MAX_RSS_MB = 1500  # ...or as soon as Chrome's processes use more memory than this
+DETAILS = False  # also load /details/experience/ and /details/education/ for the full history
+HTTP_FIRST = not DETAILS  # try a plain HTTP fetch before rendering (the details pages need the browser)
+CONCURRENCY = 3  # pages per account with --backend playwright
 # ==============================
 # HELPERS
 # ==============================
 def normalize_link(url: str) -> str:
-    if not isinstance(url, str) or "linkedin.com" not in url:
-        return None
-    parsed = urlparse(url)
-    path = parsed.path
-    return f"https://www.linkedin.com{path}".split("?")[0]
+    """Canonical www.linkedin.com profile link (see canonical.py), or None"""
+    return canonical_url(url, "linkedin")
+
+def current_company(history):
+    """Company of the newest position on the details page, if any"""
+    return next((row["company"] for row in history if row["kind"] == "experience" and row["company"]), "")
 
 # ==============================
 # LOGIN FUNCTION
 # ==============================
-def login(driver):
+def login(driver, account):
+    # Selenium only: the Playwright backend loads this module without it
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    # Fast path: one HTTP probe instead of loading the site twice
+    with TELEMETRY.phase("login_probe"):
+        valid = probe_login("linkedin", account.cookies())
+    if valid:
+        inject_cookies(driver, account.cookies())
+        print("✅ Saved session is still valid, skipped the login page loads.")
+        return
+
     try:
         print("Attempting cookie-based login...")
         # Try loading cookies
-        try:
-            with open("cookies.json", "r") as f:
-                cookies = json.load(f)
+        cookies = account.selenium_cookies()
+        if cookies:
             driver.get("https://www.linkedin.com")
             for cookie in cookies:
                 driver.add_cookie(cookie)
             print("Cookies loaded successfully.")
             driver.refresh()
-            time.sleep(3)
-        except FileNotFoundError:
-            print(" cookies.json not found, falling back to email/password login.")
+            TELEMETRY.timed_sleep("login_sleep", 3)
+        else:
+            print(f" No saved cookies for {account.name}, falling back to email/password login.")
 
         # Test if logged in
         driver.get("https://www.linkedin.com")
@@ -88,19 +117,21 @@ def login(driver):
             print("Login button clicked.")
 
             # Wait for navigation
-            time.sleep(10)
+            TELEMETRY.timed_sleep("login_sleep", 10)
 
             # Check for CAPTCHA or 2FA
             if any(x in driver.current_url for x in ["checkpoint", "verification", "challenge"]):
                 print(" CAPTCHA or 2FA detected! Solve it manually in the browser window.")
                 while any(x in driver.current_url for x in ["checkpoint", "verification", "challenge"]):
-                    time.sleep(5)
+                    TELEMETRY.timed_sleep("captcha_wait", 5)
                 print(" Verification solved.")
             else:
                 print(" Email/password login successful.")
         else:
             print(" Cookie-based login successful.")
 
+        save_state(account.state_file, storage_state(driver))
+
     except Exception as e:
         print(f" Login failed: {e}")
         raise
@@ -108,53 +139,29 @@ def login(driver):
 # ==============================
 # SCRAPER FUNCTION
 # ==============================
-def scrape_profile(url, driver):
+def scrape_profile(url, driver, cache=None):
     try:
-        driver.get(url)
-        time.sleep(random.randint(3, 6))
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(3)
-
-        name, job_title, company, location = "", "", "", ""
-        # Name
-        try:
-            name = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "h1.text-heading-xlarge"))
-            ).text
-        except:
-            pass
-
-        # Job Title
-        try:
-            job_title = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "div.text-body-medium.break-words"))
-            ).text
-        except:
-            pass
-
-        # Location
-        try:
-            location = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "span.text-body-small.inline.t-black--light.break-words"))
-            ).text
-        except:
-            pass
-
-        # Company
-        try:
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "section#experience-section"))
-            )
-            company_elements = driver.find_elements(By.CSS_SELECTOR, "div.pv-entity__company-summary-info h3 span:nth-child(2), ul.pv-profile-section__section-info li h3 span.pv-entity__secondary-title, section#experience li div.pv-entity__summary-info h3")
-            company = company_elements[0].text if company_elements else ""
-        except:
-            pass
+        with TELEMETRY.phase("get", url):
+            driver.get(url)
+        TELEMETRY.timed_sleep("settle_sleep", random.randint(3, 6), url)
+        if not DETAILS:
+            # The experience section only renders once scrolled into view
+            with TELEMETRY.phase("scroll", url):
+                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            TELEMETRY.timed_sleep("scroll_sleep", 3, url)
+
+        fields = extract_with_selenium(driver, "linkedin", cache=cache, link=url)
+        history = details_with_selenium(driver, url) if DETAILS else []
+        name = fields["name"]
+        job_title = fields["job_title"]
+        company = fields["company"]
+        location = fields["location"]
 
         name = name.strip()
         if name.lower() in ["join linkedin", "sign in"]:
             name = ""
         job_title = job_title.strip()
-        company = company.strip()
+        company = company.strip() or current_company(history)
         location = location.strip()
 
         print(f" Scraped: {url}")
@@ -163,48 +170,46 @@ def scrape_profile(url, driver):
             "name": name,
             "job_title": job_title,
             "company": company,
-            "location": location
+            "location": location,
+            "history": history
         }
     except Exception as e:
         print(f" Failed to scrape {url}: {e}")
         return {"Linkedin_Link": url, "name": "", "job_title": "", "company": "", "location": ""}
 
-# ==============================
-# MAIN
-# ==============================
-def main():
-    print(f"Debug: Email={EMAIL}, Password={'*' * len(PASSWORD) if PASSWORD else 'None'}")
-    df = pd.read_csv(INPUT_FILE)
-    urls = df["Linkedin_Link"].dropna().apply(normalize_link).dropna().tolist()[:20]
-    results = []
-
-    # Set up Selenium WebDriver
-    options = webdriver.ChromeOptions()
-    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36")
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-    driver.set_window_size(1920, 1080)
-
+async def scrape_profile_async(url, page, cache=None):
+    """Playwright twin of scrape_profile, for --backend playwright"""
     try:
-        login(driver)
-        for batch_start in range(0, len(urls), BATCH_SIZE):
-            batch = urls[batch_start:batch_start + BATCH_SIZE]
-            print(f"\n Starting batch {batch_start//BATCH_SIZE + 1}: {batch}")
-            for url in batch:
-                data = scrape_profile(url, driver)
-                results.append(data)
-                wait_time = random.randint(*DELAY_BETWEEN_PROFILES)
-                print(f"⏳ Waiting {wait_time} seconds...")
-                time.sleep(wait_time)
-            print(" Cooling down for 2 minutes...")
-            time.sleep(120)
-    finally:
-        driver.quit()
-
-    pd.DataFrame(results).to_csv(OUTPUT_FILE, index=False)
-    print(f"\n Saved results to {OUTPUT_FILE}")
+        with TELEMETRY.phase("get", url):
+            await page.goto(url, timeout=60000)
+        delay = random.randint(3000, 6000)
+        with TELEMETRY.phase("settle_sleep", url, planned=delay / 1000):
+            await page.wait_for_timeout(delay)
+
+        fields = await extract_with_playwright(page, "linkedin", cache=cache, link=url)
+        history = await details_with_playwright(page, url) if DETAILS else []
+        name = fields["name"].strip()
+        if name.lower() in ["join linkedin", "sign in"]:
+            name = ""
+
+        return {
+            "Linkedin_Link": url,
+            "name": name,
+            "job_title": fields["job_title"].strip(),
+            "company": fields["company"].strip() or current_company(history),
+            "location": fields["location"].strip(),
+            "history": history
+        }
+
+    except Exception as e:
+        print(f"❌ Failed to scrape {url}: {e}")
+        return {"Linkedin_Link": url, "name": "", "job_title": "", "company": "", "location": ""}
 
 # ==============================
 # RUN
 # ==============================
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Same as `python engine.py linkedin`; --backend playwright and --reparse work too
+    from engine import main
+
+    main(default_sites=["linkedin"])
\ No newline at end of file
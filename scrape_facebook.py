@@ -1,18 +1,18 @@
-import pandas as pd
-import random
-import time
-import json
-from urllib.parse import urlparse
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from dotenv import load_dotenv
+import asyncio
 import os
+from extraction import extract_with_selenium, extract_with_playwright
+from canonical import canonical_url, subpage_url as canonical_subpage_url
+from pacing import RESTRICTION_SIGNALS
+from telemetry import TELEMETRY
+from warm_start import probe_login, inject_cookies, storage_state, save_state
+from resource_blocking import enable_cdp_blocking, install_route_blocking
 
 # Load environment variables
+try:
+    from dotenv import load_dotenv
+except ImportError:  # optional; credentials can come straight from the environment
+    load_dotenv = lambda: None
+
 load_dotenv()
 EMAIL = os.getenv("FACEBOOK_EMAIL")
 PASSWORD = os.getenv("FACEBOOK_PASSWORD")
@@ -20,37 +20,62 @@ PASSWORD = os.getenv("FACEBOOK_PASSWORD")
 # ==============================
 # CONFIG
 # ==============================
+SITE = "facebook"  # site adapter for engine.py
+LINK_COLUMN = "Facebook_Link"
+SCORE_COLUMN = "Facebook_Score"
 INPUT_FILE = "onlytenfb.csv"  # must have column "Facebook_Link"
 OUTPUT_FILE = "facebook_profiles.csv"
-BATCH_SIZE = 5  # profiles per run
-DELAY_BETWEEN_PROFILES = (30, 90)  # seconds (min, max)
+CHECKPOINT_FILE = "facebook_profiles.jsonl"  # one JSON result per line, appended as scraped
+BATCH_SIZE = 5  # profiles per batch, per account
+PROFILES_PER_ACCOUNT = 20  # leases per account per run
+MIN_SCORE = 60  # skip roster matches with a lower Facebook_Score
+PRIORITY = ["Facebook_Score", "passing_year"]  # highest first; the budget goes to these
+DELAY_BETWEEN_PROFILES = (30, 90)  # seconds (min, max), scaled by backoff
+BATCH_COOLDOWN = 120  # seconds between batches, scaled by backoff
+PER_HOUR_BUDGET = 40  # max profile visits per hour, per account
+PER_DAY_BUDGET = 250  # max profile visits per day, per account
+CACHE_PAGES = True  # keep raw HTML in page_cache/ for --reparse
+HEADLESS = False  # True to run Chrome without a window
+RECYCLE_EVERY = 150  # restart Chrome (keeping cookies) after this many rendered profiles
+MAX_RSS_MB = 1500  # ...or as soon as Chrome's processes use more memory than this
+HTTP_FIRST = True  # try a plain HTTP fetch before rendering in Chrome
+CONCURRENCY = 2  # pages per account with --backend playwright (each opens a wave of tabs)
 # ==============================
 # HELPERS
 # ==============================
 def normalize_link(url: str) -> str:
-    if not isinstance(url, str) or "facebook.com" not in url:
-        return None
-    parsed = urlparse(url)
-    path = parsed.path
-    return f"https://www.facebook.com{path}".split("?")[0]
+    """Canonical www.facebook.com profile link (see canonical.py), or None"""
+    return canonical_url(url, "facebook")
 
 # ==============================
 # LOGIN FUNCTION
 # ==============================
-def login(driver):
+def login(driver, account):
+    # Selenium only: the Playwright backend loads this module without it
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    # Fast path: one HTTP probe instead of loading the site twice
+    with TELEMETRY.phase("login_probe"):
+        valid = probe_login("facebook", account.cookies())
+    if valid:
+        inject_cookies(driver, account.cookies())
+        print("✅ Saved session is still valid, skipped the login page loads.")
+        return
+
     try:
         print("Attempting cookie-based login...")
-        try:
-            with open("cookies.json", "r") as f:
-                cookies = json.load(f)
+        cookies = account.selenium_cookies()
+        if cookies:
             driver.get("https://www.facebook.com")
             for cookie in cookies:
                 driver.add_cookie(cookie)
             print("Cookies loaded successfully.")
             driver.refresh()
-            time.sleep(3)
-        except FileNotFoundError:
-            print("⚠️ cookies.json not found, falling back to email/password login.")
+            TELEMETRY.timed_sleep("login_sleep", 3)
+        else:
+            print(f"⚠️ No saved cookies for {account.name}, falling back to email/password login.")
 
         driver.get("https://www.facebook.com")
         WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
@@ -86,7 +111,7 @@ def login(driver):
             print("Login button clicked.")
 
             # Wait for potential CAPTCHA or 2FA
-            time.sleep(10)
+            TELEMETRY.timed_sleep("login_sleep", 10)
 
             # Check for CAPTCHA or 2FA
             if any(x in driver.current_url for x in ["checkpoint", "login/alert", "twofactor"]):
@@ -114,77 +139,122 @@ def login(driver):
             raise Exception("Failed to log in after CAPTCHA/2FA")
         print("✅ Final login verification successful.")
 
+        save_state(account.state_file, storage_state(driver))
+
     except Exception as e:
         print(f"❌ Login failed: {e}")
         raise
 
+# ==============================
+# NAVIGATION PLANNER
+# ==============================
+# Subpages that can fill each field, in order of preference
+FIELD_SOURCES = {
+    "name": ["profile"],
+    "job_title": ["about", "about_work_and_education"],
+    "company": ["about", "about_work_and_education"],
+    "location": ["about", "about_places"],
+}
+SUBPAGE_PATHS = {
+    "profile": "",
+    "about": "/about",
+    "about_work_and_education": "/about_work_and_education",
+    "about_places": "/about_places",
+}
+SETTLE_SECONDS = 1  # one scroll + this pause per tab, instead of 3x2 s scrolls
+
+def subpage_url(url, page):
+    return canonical_subpage_url(url, SUBPAGE_PATHS[page])
+
+def plan_pages(fields, visited):
+    """Next wave of subpages: the first unvisited source of every still-empty field"""
+    wave = []
+    for field, sources in FIELD_SOURCES.items():
+        if fields.get(field):
+            continue
+        for page in sources:
+            if page not in visited:
+                if page not in wave:
+                    wave.append(page)
+                break
+    return wave
+
+def load_wave(driver, url, wave):
+    """Start every page of a wave loading at once.
+
+    Extra pages open in background tabs via window.open (non-blocking), the
+    first one loads in the current tab. Each new tab is its own DevTools
+    target, so it opens on about:blank, gets the CDP request blocking, and
+    only then starts loading its page. Returns {page: window handle}.
+    """
+    main = driver.current_window_handle
+    tabs = {}
+    for page in wave[1:]:
+        before = set(driver.window_handles)
+        driver.execute_script("window.open('about:blank', '_blank');")
+        opened = set(driver.window_handles) - before
+        handle = tabs[page] = opened.pop() if opened else None
+        if handle is not None:
+            driver.switch_to.window(handle)
+            enable_cdp_blocking(driver)
+            driver.execute_script("window.location.href = arguments[0];", subpage_url(url, page))
+    driver.switch_to.window(main)
+    driver.get(subpage_url(url, wave[0]))
+    tabs[wave[0]] = main
+    return tabs
+
+def read_wave(driver, url, wave, tabs, fields, cache=None):
+    """Extract each tab of a wave into `fields`, closing the extra tabs"""
+    main = tabs[wave[0]]
+    try:
+        for page in wave:
+            handle = tabs.get(page)
+            if handle is None:
+                driver.switch_to.window(main)
+                driver.get(subpage_url(url, page))
+            else:
+                driver.switch_to.window(handle)
+            with TELEMETRY.phase("scroll", url, page=page):
+                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            TELEMETRY.timed_sleep("settle_sleep", SETTLE_SECONDS, url)
+            found = extract_with_selenium(driver, "facebook", page, cache=cache, link=url)
+            for field, value in found.items():
+                if value and not fields.get(field):
+                    fields[field] = value
+    finally:
+        for handle in driver.window_handles:
+            if handle != main:
+                driver.switch_to.window(handle)
+                driver.close()
+        driver.switch_to.window(main)
+
 # ==============================
 # SCRAPER FUNCTION
 # ==============================
-def scrape_profile(url, driver):
+def scrape_profile(url, driver, cache=None):
     try:
-        driver.get(url)
-        time.sleep(random.randint(3, 6))
-        for _ in range(3):
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
-
-        name, job_title, company, location = "", "", "", ""
-        # Name
-        try:
-            name = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "h1"))
-            ).text
-        except:
-            print(f"⚠️ Name not found for {url}")
-
-        # Navigate to About page
-        driver.get(f"{url}/about")
-        time.sleep(random.randint(3, 6))
-        for _ in range(3):
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
-
-        # Job Title and Company (from Work section)
-        try:
-            work_section = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "div[data-gt*='work']"))
-            )
-            print(f"Debug: Work section HTML for {url}: {work_section.get_attribute('outerHTML')[:500]}...")
-            work_info = work_section.text.split("\n")
-            job_title = work_info[0] if work_info else ""
-            company = work_info[1] if len(work_info) > 1 else ""
-        except:
-            print(f"⚠️ Work section not found for {url}")
-            driver.get(f"{url}/about_work_and_education")
-            time.sleep(3)
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
-            try:
-                work_elements = driver.find_elements(By.CSS_SELECTOR, "div.x1yztbdb div.x1i10hfl span")
-                if work_elements:
-                    job_title = work_elements[0].text if len(work_elements) > 0 else ""
-                    company = work_elements[1].text if len(work_elements) > 1 else ""
-            except:
-                print(f"⚠️ Company/Job not found in Work tab for {url}")
-
-        # Location (from Places section)
-        try:
-            places_section = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "div[data-gt*='places']"))
-            )
-            location = places_section.text.split("\n")[0]
-        except:
-            print(f"⚠️ Places section not found for {url}")
-            driver.get(f"{url}/about_places")
-            time.sleep(3)
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
-            try:
-                location_elements = driver.find_elements(By.CSS_SELECTOR, "div.x1yztbdb div.x1i10hfl span")
-                location = location_elements[0].text if location_elements else ""
-            except:
-                print(f"⚠️ Location not found in Places tab for {url}")
+        fields = {field: "" for field in FIELD_SOURCES}
+        visited = set()
+        wave = plan_pages(fields, visited)
+        while wave:
+            print(f"🗺️ Loading {', '.join(wave)} for {url}")
+            with TELEMETRY.phase("load_wave", url, pages=wave):
+                tabs = load_wave(driver, url, wave)
+            read_wave(driver, url, wave, tabs, fields, cache)
+            visited.update(wave)
+            if any(signal in driver.current_url for signal in RESTRICTION_SIGNALS):
+                print(f"⚠️ Redirected to {driver.current_url}, skipping remaining subpages")
+                break
+            wave = plan_pages(fields, visited)
+
+        missing = [field for field, value in fields.items() if not value]
+        if missing:
+            print(f"⚠️ Not found for {url}: {', '.join(missing)}")
+
+        name = fields["name"]
+        job_title = fields["job_title"]
+        company = fields["company"]
+        location = fields["location"]
 
         name = name.strip()
         if name.lower() in ["facebook", "log in"]:
@@ -205,41 +275,66 @@ def scrape_profile(url, driver):
         print(f"❌ Failed to scrape {url}: {e}")
         return {"Facebook_Link": url, "name": "", "job_title": "", "company": "", "location": ""}
 
-# ==============================
-# MAIN
-# ==============================
-def main():
-    print(f"Debug: Email={EMAIL}, Password={'*' * len(PASSWORD) if PASSWORD else 'None'}")
-    df = pd.read_csv(INPUT_FILE)
-    urls = df["Facebook_Link"].dropna().apply(normalize_link).dropna().tolist()[:20]
-    results = []
-
-    options = webdriver.ChromeOptions()
-    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36")
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-    driver.set_window_size(1920, 1080)
-
+async def read_wave_async(page, url, wave, fields, cache=None):
+    """Playwright twin of load_wave + read_wave: extra pages of the context
+    load side by side with the main one, then each is extracted"""
+    pages = [page]
     try:
-        login(driver)
-        for batch_start in range(0, len(urls), BATCH_SIZE):
-            batch = urls[batch_start:batch_start + BATCH_SIZE]
-            print(f"\n🚀 Starting batch {batch_start//BATCH_SIZE + 1}: {batch}")
-            for url in batch:
-                data = scrape_profile(url, driver)
-                results.append(data)
-                wait_time = random.randint(*DELAY_BETWEEN_PROFILES)
-                print(f"⏳ Waiting {wait_time} seconds...")
-                time.sleep(wait_time)
-            print("😴 Cooling down for 2 minutes...")
-            time.sleep(120)
+        for _ in wave[1:]:
+            extra = await page.context.new_page()
+            await install_route_blocking(extra, "facebook")
+            pages.append(extra)
+        with TELEMETRY.phase("load_wave", url, pages=wave):
+            await asyncio.gather(*(p.goto(subpage_url(url, name), timeout=60000) for p, name in zip(pages, wave)),
+                                 return_exceptions=True)
+        for p, name in zip(pages, wave):
+            with TELEMETRY.phase("scroll", url, page=name):
+                await p.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+            with TELEMETRY.phase("settle_sleep", url, planned=SETTLE_SECONDS):
+                await p.wait_for_timeout(SETTLE_SECONDS * 1000)
+            found = await extract_with_playwright(p, "facebook", name, cache=cache, link=url)
+            for field, value in found.items():
+                if value and not fields.get(field):
+                    fields[field] = value
     finally:
-        driver.quit()
+        for extra in pages[1:]:
+            await extra.close()
+
+async def scrape_profile_async(url, page, cache=None):
+    """Playwright twin of scrape_profile, for --backend playwright"""
+    try:
+        fields = {field: "" for field in FIELD_SOURCES}
+        visited = set()
+        wave = plan_pages(fields, visited)
+        while wave:
+            print(f"🗺️ Loading {', '.join(wave)} for {url}")
+            await read_wave_async(page, url, wave, fields, cache)
+            visited.update(wave)
+            if any(signal in page.url for signal in RESTRICTION_SIGNALS):
+                print(f"⚠️ Redirected to {page.url}, skipping remaining subpages")
+                break
+            wave = plan_pages(fields, visited)
 
-    pd.DataFrame(results).to_csv(OUTPUT_FILE, index=False)
-    print(f"\n✅ Saved results to {OUTPUT_FILE}")
+        name = fields["name"].strip()
+        if name.lower() in ["facebook", "log in"]:
+            name = ""
+        print(f"✅ Scraped: {url} (Company: {fields['company'].strip()})")
+        return {
+            "Facebook_Link": url,
+            "name": name,
+            "job_title": fields["job_title"].strip(),
+            "company": fields["company"].strip(),
+            "location": fields["location"].strip()
+        }
+    except Exception as e:
+        print(f"❌ Failed to scrape {url}: {e}")
+        return {"Facebook_Link": url, "name": "", "job_title": "", "company": "", "location": ""}
 
 # ==============================
 # RUN
 # ==============================
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Same as `python engine.py facebook`; --backend playwright and --reparse work too
+    from engine import main
+
+    main(default_sites=["facebook"])
@@ -0,0 +1,143 @@
+import atexit
+import json
+import os
+import threading
+
+# ==============================
+# CONFIG
+# ==============================
+STATS_FILE = "selector_stats.json"  # persisted hit/miss history
+RECENT_WINDOW = 50       # outcomes kept per selector / field for recent rates
+DEAD_AFTER = 25          # consecutive recent misses (and no hits) => skip selector
+PROBE_EVERY = 10         # still try a dead selector on every Nth page
+DROP_MIN_TRIES = 50      # tries before the recent window needed to raise a drop alert
+DROP_RATIO = 0.5         # alert when recent hit rate < this x the earlier rate
+SAVE_EVERY = 10          # flush stats to disk every N recorded pages
+
+# ==============================
+# REGISTRY
+# ==============================
+def spec_id(spec):
+    return json.dumps(spec, sort_keys=True)
+
+class SelectorRegistry:
+    """Learns which selector of each fallback chain actually hits.
+
+    Chains come from extraction.SELECTOR_MAP; this class only reorders them
+    by observed hit rate, drops selectors that have recently done nothing
+    but miss (probing them now and then so they can recover), and warns when
+    a field's hit rate falls off a cliff, which usually means a DOM change.
+    """
+
+    def __init__(self, stats_file=STATS_FILE):
+        self.stats_file = stats_file
+        self.lock = threading.Lock()
+        self.stats = None
+        self.pages_seen = 0
+        self.alerted = set()
+
+    # ---------- persistence ----------
+    def _load(self):
+        if self.stats is not None:
+            return
+        self.stats = {"selectors": {}, "fields": {}}
+        if self.stats_file and os.path.exists(self.stats_file):
+            try:
+                with open(self.stats_file, "r") as f:
+                    self.stats = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                print(f"⚠️ Could not read {self.stats_file}, starting selector stats fresh")
+        atexit.register(self.save)
+
+    def save(self):
+        with self.lock:
+            if self.stats is None or not self.stats_file:
+                return
+            tmp = f"{self.stats_file}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(self.stats, f)
+            os.replace(tmp, self.stats_file)
+
+    def _entry(self, kind, key):
+        return self.stats[kind].setdefault(key, {"hits": 0, "tries": 0, "recent": []})
+
+    @staticmethod
+    def _bump(entry, hit):
+        entry["tries"] += 1
+        entry["hits"] += int(hit)
+        entry["recent"] = (entry["recent"] + [int(hit)])[-RECENT_WINDOW:]
+
+    # ---------- ordering ----------
+    def is_dead(self, entry):
+        recent = entry["recent"][-DEAD_AFTER:]
+        return len(recent) >= DEAD_AFTER and not any(recent)
+
+    def ordered(self, site, page, spec):
+        """Copy of a page spec with every chain sorted best-first, dead selectors dropped"""
+        with self.lock:
+            self._load()
+            probe = self.pages_seen % PROBE_EVERY == 0
+            fields = {}
+            for field, chain in spec["fields"].items():
+                ranked = []
+                for position, s in enumerate(chain):
+                    entry = self.stats["selectors"].get(f"{site}|{page}|{field}|{spec_id(s)}")
+                    if entry is None:
+                        ranked.append((-0.5, position, s))
+                        continue
+                    if self.is_dead(entry) and not probe:
+                        continue
+                    rate = (entry["hits"] + 1) / (entry["tries"] + 2)
+                    ranked.append((-rate, position, s))
+                fields[field] = [s for _, _, s in sorted(ranked, key=lambda r: (r[0], r[1]))]
+            return {**spec, "fields": fields}
+
+    # ---------- learning ----------
+    def record(self, site, page, spec, hits):
+        """Record one extraction: `hits[field]` is the chain index that matched, or -1"""
+        with self.lock:
+            self._load()
+            self.pages_seen += 1
+            for field, chain in spec["fields"].items():
+                hit_at = hits.get(field, -1)
+                tried = chain if hit_at < 0 else chain[:hit_at + 1]
+                for position, s in enumerate(tried):
+                    self._bump(self._entry("selectors", f"{site}|{page}|{field}|{spec_id(s)}"), position == hit_at)
+                field_entry = self._entry("fields", f"{site}|{page}|{field}")
+                self._bump(field_entry, hit_at >= 0)
+                self._check_drop(f"{site}|{page}|{field}", field_entry)
+            flush = self.pages_seen % SAVE_EVERY == 0
+        if flush:
+            self.save()
+
+    def _check_drop(self, key, entry):
+        recent = entry["recent"]
+        earlier_tries = entry["tries"] - len(recent)
+        if earlier_tries < DROP_MIN_TRIES or len(recent) < RECENT_WINDOW or key in self.alerted:
+            return
+        earlier = (entry["hits"] - sum(recent)) / earlier_tries
+        current = sum(recent) / len(recent)
+        if earlier > 0 and current < earlier * DROP_RATIO:
+            self.alerted.add(key)
+            print(f"🚨 Selector hit rate for {key} dropped to {current:.0%} "
+                  f"(was {earlier:.0%}); the page layout has probably changed")
+
+    def report(self):
+        """One line per field: lifetime vs recent hit rate, plus dead selectors"""
+        with self.lock:
+            self._load()
+            lines = []
+            for key, entry in sorted(self.stats["fields"].items()):
+                recent = entry["recent"]
+                current = sum(recent) / len(recent) if recent else 0.0
+                lifetime = entry["hits"] / entry["tries"] if entry["tries"] else 0.0
+                dead = sum(1 for k, e in self.stats["selectors"].items()
+                           if k.startswith(key + "|") and self.is_dead(e))
+                lines.append(f"{key}: lifetime {lifetime:.0%}, recent {current:.0%}, dead selectors {dead}")
+            return lines
+
+REGISTRY = SelectorRegistry()
+
+if __name__ == "__main__":
+    for line in REGISTRY.report():
+        print(line)
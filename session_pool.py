@@ -0,0 +1,169 @@
+import json
+import os
+import threading
+import time
+
+from pacing import PacingScheduler
+
+# ==============================
+# CONFIG
+# ==============================
+SESSIONS_DIR = "sessions"        # <account>.json: cookie list or Playwright storage_state
+HEALTH_FILE = "health.json"      # kept inside SESSIONS_DIR
+STATE_DIR = "login_state"        # refreshed storage_state per account, reused next run
+QUARANTINE_HOURS = 24            # how long a checkpointed account sits out
+MAX_SOFT_RESTRICTIONS = 3        # empty-name pages in a row before quarantine
+HARD_SIGNALS = ("checkpoint", "challenge", "authwall", "twofactor")
+
+SITE_DOMAINS = {"linkedin": "linkedin.com", "facebook": "facebook.com"}
+
+# ==============================
+# ACCOUNT
+# ==============================
+class Account:
+    """One logged-in identity: its state file, pacing budget and health"""
+
+    def __init__(self, name, path, site, scheduler):
+        self.name = name
+        self.path = path
+        self.site = site
+        self.scheduler = scheduler
+        self.soft_strikes = 0
+        self.state_file = os.path.join(STATE_DIR, f"{site}-{name}.json")
+
+    def load_state(self):
+        """The state saved after the last login if there is one, else the account file"""
+        for path in (self.state_file, self.path):
+            try:
+                with open(path, "r") as f:
+                    return json.load(f)
+            except FileNotFoundError:
+                continue
+            except json.JSONDecodeError:
+                print(f"⚠️ Ignoring corrupt session file {path}")
+        return []
+
+    @property
+    def state_path(self):
+        """File to hand Playwright's storage_state= (the freshest one on disk)"""
+        return self.state_file if os.path.exists(self.state_file) else self.path
+
+    @property
+    def is_storage_state(self):
+        return isinstance(self.load_state(), dict)
+
+    def cookies(self):
+        """Cookies in the list format cookies.json uses"""
+        state = self.load_state()
+        return state.get("cookies", []) if isinstance(state, dict) else state
+
+    def selenium_cookies(self):
+        """Cookies trimmed to the keys driver.add_cookie accepts"""
+        out = []
+        for c in self.cookies():
+            cookie = {k: c[k] for k in ("name", "value", "domain", "path", "secure", "httpOnly") if k in c}
+            expires = c.get("expiry", c.get("expires"))
+            if expires and expires > 0:
+                cookie["expiry"] = int(expires)
+            if c.get("sameSite") in ("Strict", "Lax", "None"):
+                cookie["sameSite"] = c["sameSite"]
+            out.append(cookie)
+        return out
+
+    def __repr__(self):
+        return f"Account({self.site}:{self.name})"
+
+# ==============================
+# POOL
+# ==============================
+class SessionPool:
+    """Accounts for one site, spread across workers with health tracking.
+
+    Every account gets its own PacingScheduler (so budgets are per account),
+    and accounts that hit a checkpoint/challenge page, or return several
+    empty-name pages in a row, are quarantined for QUARANTINE_HOURS. The
+    quarantine survives restarts via SESSIONS_DIR/health.json. With no
+    session files for the site, the pool falls back to `fallback_cookie_file`.
+    """
+
+    def __init__(self, site, sessions_dir=SESSIONS_DIR, fallback_cookie_file="cookies.json", **pacing):
+        self.site = site
+        self.sessions_dir = sessions_dir
+        self.health_path = os.path.join(sessions_dir, HEALTH_FILE)
+        self.lock = threading.Lock()
+        self.health = self._load_health()
+        self.accounts = []
+
+        if os.path.isdir(sessions_dir):
+            for fname in sorted(os.listdir(sessions_dir)):
+                if not fname.endswith(".json") or fname == HEALTH_FILE:
+                    continue
+                name = fname[:-len(".json")]
+                account = Account(name, os.path.join(sessions_dir, fname), site,
+                                  PacingScheduler(f"{site}:{name}", **pacing))
+                try:
+                    if any(SITE_DOMAINS[site] in (c.get("domain") or "") for c in account.cookies()):
+                        self.accounts.append(account)
+                except (OSError, ValueError) as e:
+                    print(f"⚠️ Skipping unreadable session file {account.path}: {e}")
+        if not self.accounts:
+            # Single-account mode: login() falls back to email/password if needed
+            self.accounts.append(Account("default", fallback_cookie_file, site,
+                                         PacingScheduler(site, **pacing)))
+        print(f"👥 {len(self.accounts)} {site} account(s), {len(self.available())} healthy")
+
+    # ---------- health ----------
+    def _load_health(self):
+        try:
+            with open(self.health_path, "r") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save_health(self):
+        # Single-cookie-file runs have no sessions/ yet; quarantine must still survive a restart
+        os.makedirs(self.sessions_dir, exist_ok=True)
+        with open(self.health_path, "w") as f:
+            json.dump(self.health, f, indent=2)
+
+    def _key(self, account):
+        return f"{self.site}:{account.name}"
+
+    def is_quarantined(self, account):
+        with self.lock:
+            entry = self.health.get(self._key(account), {})
+            return entry.get("quarantined_until", 0) > time.time()
+
+    def available(self):
+        return [a for a in self.accounts if not self.is_quarantined(a)]
+
+    def quarantine(self, account, reason):
+        with self.lock:
+            entry = self.health.setdefault(self._key(account), {})
+            entry["quarantined_until"] = time.time() + QUARANTINE_HOURS * 3600
+            entry["reason"] = reason
+            entry["quarantines"] = entry.get("quarantines", 0) + 1
+            self._save_health()
+        print(f"🚫 Quarantined {account} for {QUARANTINE_HOURS}h: {reason}")
+
+    def record(self, account, url, current_url="", name=None):
+        """Feed one outcome to the account's pacer; returns True if the account was quarantined"""
+        restricted = account.scheduler.record(url, current_url, name)
+        with self.lock:
+            entry = self.health.setdefault(self._key(account), {})
+            entry["profiles"] = entry.get("profiles", 0) + 1
+            entry["restrictions"] = entry.get("restrictions", 0) + int(restricted)
+            entry["last_used"] = time.time()
+        if any(signal in (current_url or "").lower() for signal in HARD_SIGNALS):
+            self.quarantine(account, f"redirected to {current_url}")
+            return True
+        account.soft_strikes = account.soft_strikes + 1 if restricted else 0
+        if account.soft_strikes >= MAX_SOFT_RESTRICTIONS:
+            self.quarantine(account, f"{account.soft_strikes} restricted pages in a row")
+            return True
+        return False
+
+    def summary(self):
+        with self.lock:
+            self._save_health()
+            return {self._key(a): dict(self.health.get(self._key(a), {})) for a in self.accounts}
@@ -0,0 +1,153 @@
+import json
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+# ==============================
+# CONFIG
+# ==============================
+TELEMETRY_FILE = "telemetry.jsonl"   # one event per line, appended across runs
+BUCKETS = [0.1, 0.5, 1, 2, 5, 10, 30, 60, 300]  # histogram upper bounds (s)
+BARS = " ▁▂▃▄▅▆▇█"
+
+# ==============================
+# RECORDER
+# ==============================
+class Telemetry:
+    """Structured timing events for the phases of a crawl.
+
+    `phase()` times a block (driver.get, fixed sleeps, scrolls, root waits,
+    extraction, pacing delays...) and appends a JSONL event; `fields()`
+    records per-field hit/miss/timeout outcomes and `profile()` one finished
+    profile. `summary()` turns what this process recorded into per-phase
+    histograms and a profiles/hour figure.
+    """
+
+    def __init__(self, path=TELEMETRY_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.run = time.strftime("%Y%m%d-%H%M%S")
+        self.started = time.time()
+        self.durations = defaultdict(list)
+        self.outcomes = defaultdict(lambda: defaultdict(int))
+        self.profiles = defaultdict(int)
+
+    def start_run(self, name):
+        with self.lock:
+            self.run = f"{name}-{time.strftime('%Y%m%d-%H%M%S')}"
+            self.started = time.time()
+            self.durations.clear()
+            self.outcomes.clear()
+            self.profiles.clear()
+        self.event("run_start")
+
+    def event(self, kind, **fields):
+        entry = {"ts": round(time.time(), 3), "run": self.run, "event": kind, **fields}
+        if not self.path:
+            return
+        with self.lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    @contextmanager
+    def phase(self, name, profile=None, **fields):
+        """Time the enclosed block; also works around awaits inside async code"""
+        start = time.perf_counter()
+        ok = True
+        try:
+            yield
+        except BaseException:
+            ok = False
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            with self.lock:
+                self.durations[name].append(seconds)
+            self.event("phase", phase=name, profile=profile, seconds=round(seconds, 3), ok=ok, **fields)
+
+    def timed_sleep(self, name, seconds, profile=None):
+        """time.sleep that shows up as its own phase"""
+        with self.phase(name, profile, planned=round(seconds, 2)):
+            time.sleep(seconds)
+
+    def fields(self, site, page, values, profile=None, timed_out=False):
+        """Per-field outcome of one extraction: hit, miss, or timeout (root never appeared)"""
+        outcomes = {f: "hit" if v else ("timeout" if timed_out else "miss") for f, v in values.items()}
+        with self.lock:
+            for field, outcome in outcomes.items():
+                self.outcomes[f"{site}|{page}|{field}"][outcome] += 1
+        self.event("fields", site=site, page=page, profile=profile, outcomes=outcomes)
+
+    def profile(self, url, via, name_found):
+        with self.lock:
+            self.profiles[via] += 1
+        self.event("profile", profile=url, via=via, name_found=bool(name_found))
+
+    # ---------- report ----------
+    def summary(self):
+        with self.lock:
+            elapsed = time.time() - self.started
+            lines = summarize(self.durations, self.outcomes, self.profiles, elapsed)
+        self.event("run_end", elapsed=round(elapsed, 1), profiles=dict(self.profiles))
+        return lines
+
+def histogram(values):
+    counts = [0] * (len(BUCKETS) + 1)
+    for v in values:
+        counts[next((i for i, b in enumerate(BUCKETS) if v <= b), len(BUCKETS))] += 1
+    top = max(counts) or 1
+    return "".join(BARS[round(c / top * (len(BARS) - 1))] for c in counts)
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+def summarize(durations, outcomes, profiles, elapsed):
+    total_profiles = sum(profiles.values())
+    rate = total_profiles / (elapsed / 3600) if elapsed > 0 else 0.0
+    # Phases nest (profile > get > ...) and workers overlap, so shares are
+    # of wall time and need not add up to 100%
+    wall = elapsed or 1
+    lines = [f"📊 {total_profiles} profiles in {elapsed / 60:.1f} min = {rate:.1f} profiles/hour "
+             f"({', '.join(f'{via}: {n}' for via, n in sorted(profiles.items())) or 'none'})",
+             f"{'phase':<22}{'n':>6}{'total s':>10}{'of wall':>8}{'p50':>8}{'p95':>8}  "
+             f"hist ≤{'/'.join(str(b) for b in BUCKETS)}s/more"]
+    for name, values in sorted(durations.items(), key=lambda kv: -sum(kv[1])):
+        lines.append(f"{name:<22}{len(values):>6}{sum(values):>10.1f}{sum(values) / wall:>8.0%}"
+                     f"{percentile(values, 0.5):>8.2f}{percentile(values, 0.95):>8.2f}  {histogram(values)}")
+    for key, counts in sorted(outcomes.items()):
+        n = sum(counts.values())
+        lines.append(f"field {key}: hit {counts['hit'] / n:.0%}, miss {counts['miss']}, timeout {counts['timeout']}")
+    return lines
+
+def summarize_file(path=TELEMETRY_FILE, run=None):
+    """Rebuild the summary of a past run (the latest one by default) from the JSONL"""
+    events = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                events.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    runs = [e["run"] for e in events if e.get("event") == "run_start"]
+    run = run or (runs[-1] if runs else None)
+    events = [e for e in events if e.get("run") == run]
+    durations, outcomes, profiles = defaultdict(list), defaultdict(lambda: defaultdict(int)), defaultdict(int)
+    for e in events:
+        if e["event"] == "phase":
+            durations[e["phase"]].append(e["seconds"])
+        elif e["event"] == "fields":
+            for field, outcome in e["outcomes"].items():
+                outcomes[f"{e['site']}|{e['page']}|{field}"][outcome] += 1
+        elif e["event"] == "profile":
+            profiles[e["via"]] += 1
+    elapsed = events[-1]["ts"] - events[0]["ts"] if events else 0.0
+    return [f"run {run}"] + summarize(durations, outcomes, profiles, elapsed)
+
+TELEMETRY = Telemetry()
+
+if __name__ == "__main__":
+    import sys
+
+    for line in summarize_file(*sys.argv[1:3]):
+        print(line)
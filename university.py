@@ -0,0 +1,12 @@
+import re
+
+# ==============================
+# CONFIG
+# ==============================
+# Dhaka International University (api.diu.ac); Daffodil is a different institution
+UNIVERSITY_PATTERN = r"\bdiu\b|dhaka[\s-]+international[\s-]+university"
+UNIVERSITY_RE = re.compile(UNIVERSITY_PATTERN, re.IGNORECASE)
+
+def is_diu(text):
+    """True when a school name or headline mentions the roster's university"""
+    return bool(UNIVERSITY_RE.search(text or ""))
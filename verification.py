@@ -0,0 +1,182 @@
+import argparse
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:  # optional; falls back to difflib across processes
+    fuzz = process = None
+
+from canonical import profile_key
+from university import UNIVERSITY_PATTERN
+from result_store import ResultStore, MERGED_FILE, LINK_COLUMNS
+
+# ==============================
+# CONFIG
+# ==============================
+VERIFIED_FILE = "alumni_verified.csv"
+VERIFY_CHUNK = 20_000        # merged rows scored per step
+PARALLEL_MIN_ROWS = 2_000    # below this, difflib scoring stays in-process
+LOW_CONFIDENCE = 60          # confidence under this flags the profile for re-scrape
+NAME_WEIGHT = 0.6            # confidence = name share + keyword/location bonuses
+UNIVERSITY_BONUS = 15
+DEPARTMENT_BONUS = 15
+LOCATION_BONUS = 10
+
+# Honorifics and prefixes that differ freely between the roster and profiles
+NAME_STOPWORDS = {"md", "mohammad", "mohammed", "muhammad", "mohd", "mst", "mosammat", "most",
+                  "sk", "sheikh", "dr", "engr", "mr", "mrs", "ms"}
+
+# Roster department keyword -> words a matching headline would use
+DEPARTMENT_KEYWORDS = {
+    "cse": ["cse", "computer science", "software", "developer", "engineer", "programmer"],
+    "eete": ["eete", "eee", "electrical", "electronic"],
+    "civil": ["civil", "construction", "structural"],
+    "pharm": ["pharm", "pharmacist", "pharmaceutical"],
+    "bba": ["bba", "business", "marketing", "finance", "accounting", "sales", "hr"],
+    "mba": ["mba", "business", "marketing", "finance", "accounting", "manager"],
+    "ll.b": ["law", "lawyer", "advocate", "legal", "barrister"],
+    "ll.m": ["law", "lawyer", "advocate", "legal", "barrister"],
+    "sociology": ["sociology", "social", "ngo", "development", "research"],
+    "political science": ["political", "government", "policy"],
+    "english": ["english", "teacher", "lecturer", "content"],
+    "journalism": ["journalism", "journalist", "reporter", "media"],
+}
+
+# Divisions and larger districts; addresses and profile locations are
+# matched when both mention the same one
+PLACES = ["dhaka", "chittagong|chattogram", "khulna", "rajshahi", "sylhet", "barisal|barishal",
+          "rangpur", "mymensingh", "comilla|cumilla", "gazipur", "narayanganj", "bogra|bogura",
+          "jessore|jashore", "noakhali", "feni", "laksmipur|lakshmipur", "chandpur", "tangail",
+          "faridpur", "dinajpur", "pabna", "kushtia", "cox's bazar|coxs bazar", "brahmanbaria",
+          "narsingdi", "savar", "uttara", "mirpur", "dhanmondi"]
+
+# ==============================
+# NAME SIMILARITY
+# ==============================
+def clean_names(names):
+    """Lowercase, strip punctuation and honorifics; vectorized over a Series"""
+    names = names.fillna("").astype(str).str.lower().str.replace(r"[^a-z\s]", " ", regex=True)
+    return names.map(lambda n: " ".join(t for t in n.split() if t not in NAME_STOPWORDS))
+
+def token_set_ratio(a, b):
+    """0-100 like rapidfuzz's token_set_ratio: order and extra tokens barely matter"""
+    ta, tb = set(a.split()), set(b.split())
+    if not ta or not tb:
+        return 0.0
+    common = " ".join(sorted(ta & tb))
+    left = f"{common} {' '.join(sorted(ta - tb))}".strip()
+    right = f"{common} {' '.join(sorted(tb - ta))}".strip()
+    pairs = [(left, right)] + ([(common, left), (common, right)] if common else [])
+    return 100 * max(SequenceMatcher(None, x, y).ratio() for x, y in pairs)
+
+def _ratios(pairs):
+    return [token_set_ratio(a, b) for a, b in pairs]
+
+def name_scores(roster_names, scraped_names, executor=None):
+    """Similarity of each roster name to its scraped name, as a float array"""
+    a = clean_names(roster_names).tolist()
+    b = clean_names(scraped_names).tolist()
+    if process is not None:
+        return process.cpdist(a, b, scorer=fuzz.token_set_ratio, workers=-1).astype(float)
+    pairs = list(zip(a, b))
+    if executor is None or len(pairs) < PARALLEL_MIN_ROWS:
+        return np.array(_ratios(pairs), dtype=float)
+    step = -(-len(pairs) // (os.cpu_count() or 1))
+    parts = executor.map(_ratios, [pairs[i:i + step] for i in range(0, len(pairs), step)])
+    return np.array([r for part in parts for r in part], dtype=float)
+
+# ==============================
+# KEYWORD CHECKS
+# ==============================
+def shared_keyword(left, right, groups):
+    """Rows where `left` and `right` mention the same keyword group.
+
+    `groups` maps a pattern for `left` to a pattern for `right`; every
+    group is one vectorized str.contains per column.
+    """
+    left = left.fillna("").astype(str).str.lower()
+    right = right.fillna("").astype(str).str.lower()
+    hit = np.zeros(len(left), dtype=bool)
+    for left_pattern, right_pattern in groups.items():
+        hit |= (left.str.contains(left_pattern, regex=True) & right.str.contains(right_pattern, regex=True)).to_numpy()
+    return hit
+
+DEPARTMENT_GROUPS = {re.escape(k): "|".join(rf"\b{re.escape(w)}\b" for w in v) for k, v in DEPARTMENT_KEYWORDS.items()}
+PLACE_GROUPS = {p: p for p in PLACES}
+
+def score_site(chunk, site, executor=None):
+    """Confidence columns for one site's scraped fields in a merged chunk"""
+    name = chunk.get(f"{site}_name", pd.Series("", index=chunk.index))
+    headline = (chunk.get(f"{site}_job_title", pd.Series("", index=chunk.index)).fillna("") + " " +
+                chunk.get(f"{site}_company", pd.Series("", index=chunk.index)).fillna(""))
+    location = chunk.get(f"{site}_location", pd.Series("", index=chunk.index))
+
+    names = name_scores(chunk["name"], name, executor)
+    university = headline.str.lower().str.contains(UNIVERSITY_PATTERN, regex=True).to_numpy()
+    department = shared_keyword(chunk["department"], headline, DEPARTMENT_GROUPS)
+    place = shared_keyword(chunk["parmanent_add"], location, PLACE_GROUPS)
+
+    confidence = np.minimum(100, NAME_WEIGHT * names + UNIVERSITY_BONUS * university +
+                            DEPARTMENT_BONUS * department + LOCATION_BONUS * place)
+    scraped = name.fillna("").astype(str).str.strip().ne("").to_numpy()
+    status = np.where(~scraped, "", np.where(confidence >= LOW_CONFIDENCE, "ok", "low"))
+    return {
+        f"{site}_name_score": names.round(1),
+        f"{site}_confidence": confidence.round(1),
+        f"{site}_verify": status,
+    }
+
+# ==============================
+# STAGE
+# ==============================
+def verify(merged_file=MERGED_FILE, output_file=VERIFIED_FILE, store=None, chunksize=VERIFY_CHUNK):
+    """Score every merged roster row against what was scraped for it.
+
+    Writes `output_file` chunk by chunk and, given a ResultStore, flags the
+    profiles behind low-confidence rows so the scrapers fetch them again.
+    Returns {site: (scored, low)}.
+    """
+    totals = {site: [0, 0] for site in LINK_COLUMNS}
+    tmp = f"{output_file}.tmp"
+    executor = ProcessPoolExecutor() if process is None else None
+    try:
+        for i, chunk in enumerate(pd.read_csv(merged_file, chunksize=chunksize, dtype=str)):
+            for site, link_col in LINK_COLUMNS.items():
+                if f"{site}_name" not in chunk.columns:
+                    continue
+                columns = score_site(chunk, site, executor)
+                for column, values in columns.items():
+                    chunk[column] = values
+                low = columns[f"{site}_verify"] == "low"
+                totals[site][0] += int((columns[f"{site}_verify"] != "").sum())
+                totals[site][1] += int(low.sum())
+                if store is not None and low.any():
+                    flagged = chunk.loc[low, [link_col, f"{site}_confidence"]]
+                    store.flag([(profile_key(link, site), site, float(conf), "low_confidence")
+                                for link, conf in flagged.itertuples(index=False)])
+            chunk.to_csv(tmp, mode="w" if i == 0 else "a", header=i == 0, index=False)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    if os.path.exists(tmp):
+        os.replace(tmp, output_file)
+    return {site: tuple(counts) for site, counts in totals.items()}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check scraped profiles against the roster")
+    parser.add_argument("merged", nargs="?", default=MERGED_FILE, help="output of result_store.py")
+    parser.add_argument("output", nargs="?", default=VERIFIED_FILE)
+    parser.add_argument("--no-flag", action="store_true", help="score only, do not queue re-scrapes")
+    args = parser.parse_args()
+
+    store = None if args.no_flag else ResultStore()
+    for site, (scored, low) in verify(args.merged, args.output, store).items():
+        print(f"🔎 {site}: {scored} scraped rows scored, {low} below {LOW_CONFIDENCE} flagged for re-scrape")
+    if store is not None:
+        store.close()
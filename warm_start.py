@@ -0,0 +1,101 @@
+import json
+import os
+
+import requests
+
+from http_fetch import make_session
+from pacing import RESTRICTION_SIGNALS
+
+# ==============================
+# CONFIG
+# ==============================
+DRIVER_CACHE_FILE = ".chromedriver_path"  # last driver ChromeDriverManager resolved
+PROBE_TIMEOUT = 10                        # seconds for the login probe
+
+# A logged-in request answers 200 here; a logged-out one redirects to a login wall
+PROBE_URLS = {
+    "linkedin": "https://www.linkedin.com/feed/",
+    "facebook": "https://www.facebook.com/settings",
+}
+
+# ==============================
+# DRIVER
+# ==============================
+def chromedriver_path(refresh=False):
+    """Local chromedriver binary, only asking ChromeDriverManager (network) when
+    nothing usable is cached or `refresh` is set after a version mismatch"""
+    if not refresh:
+        try:
+            with open(DRIVER_CACHE_FILE, "r") as f:
+                path = f.read().strip()
+            if os.access(path, os.X_OK):
+                return path
+        except FileNotFoundError:
+            pass
+
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    path = ChromeDriverManager().install()
+    with open(DRIVER_CACHE_FILE, "w") as f:
+        f.write(path)
+    return path
+
+def start_chrome(options):
+    """webdriver.Chrome on the cached driver, re-resolving it once if Chrome
+    updated and the cached driver no longer matches"""
+    from selenium import webdriver
+    from selenium.common.exceptions import SessionNotCreatedException
+    from selenium.webdriver.chrome.service import Service
+
+    try:
+        return webdriver.Chrome(service=Service(chromedriver_path()), options=options)
+    except SessionNotCreatedException as e:
+        print(f"⚠️ Cached chromedriver rejected ({e.msg.splitlines()[0] if e.msg else e}), updating it")
+        return webdriver.Chrome(service=Service(chromedriver_path(refresh=True)), options=options)
+
+# ==============================
+# LOGIN STATE
+# ==============================
+def probe_login(site, cookies, timeout=PROBE_TIMEOUT):
+    """One request without following redirects: True if `cookies` are still logged in"""
+    if not cookies:
+        return False
+    session = make_session(cookies=cookies, pool_size=1)
+    try:
+        response = session.get(PROBE_URLS[site], timeout=timeout, allow_redirects=False, stream=True)
+        response.close()
+    except requests.RequestException as e:
+        print(f"⚠️ Login probe failed ({e}), doing a full login")
+        return False
+    finally:
+        session.close()
+    location = response.headers.get("Location", "").lower()
+    return response.status_code == 200 or (
+        response.is_redirect and not any(signal in location for signal in RESTRICTION_SIGNALS))
+
+def inject_cookies(driver, cookies):
+    """Set cookies over CDP so no page has to load first, unlike driver.add_cookie"""
+    params = []
+    for c in cookies:
+        cookie = {k: c[k] for k in ("name", "value", "domain", "path", "secure", "httpOnly") if k in c}
+        expires = c.get("expires", c.get("expiry"))
+        if expires and expires > 0:
+            cookie["expires"] = expires
+        if c.get("sameSite") in ("Strict", "Lax", "None"):
+            cookie["sameSite"] = c["sameSite"]
+        params.append(cookie)
+    driver.execute_cdp_cmd("Network.setCookies", {"cookies": params})
+
+def storage_state(driver):
+    """The browser's cookies in Playwright's storage_state layout"""
+    cookies = driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+    keep = ("name", "value", "domain", "path", "expires", "httpOnly", "secure", "sameSite")
+    return {"cookies": [{k: c[k] for k in keep if k in c} for c in cookies], "origins": []}
+
+def save_state(path, state):
+    """Atomically write a storage_state dict so a crash never leaves half a file"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, path)
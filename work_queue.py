@@ -0,0 +1,197 @@
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+# ==============================
+# CONFIG
+# ==============================
+QUEUE_FILE = "work_queue.sqlite"  # shared by every process crawling the roster
+LEASE_SECONDS = 600               # a job not finished by then goes back to the pool
+MAX_ATTEMPTS = 3                  # failed / expired leases before a job is dead-lettered
+BUSY_TIMEOUT = 30                 # seconds to wait for another process's write lock
+
+# ==============================
+# QUEUE
+# ==============================
+def worker_id(label=""):
+    """host:pid[:label], unique per process (and per account thread with a label)"""
+    base = f"{socket.gethostname()}:{os.getpid()}"
+    return f"{base}:{label}" if label else base
+
+class WorkQueue:
+    """Durable SQLite job queue with leases, retries and a dead letter state.
+
+    Several scraper processes, on one host or several hosts sharing the
+    file, enqueue the same roster (duplicates are ignored) and `lease` jobs
+    one at a time. A lease that is neither completed nor failed within
+    `lease_seconds` (crashed worker) becomes available again; after
+    `max_attempts` failed or expired leases the job is marked dead. Jobs can
+    be pinned to one account; unpinned jobs go to any account of their site.
+
+    Job states: pending -> leased -> done | pending (retry) | dead.
+    """
+
+    def __init__(self, path=QUEUE_FILE, lease_seconds=LEASE_SECONDS, max_attempts=MAX_ATTEMPTS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+        # isolation_level=None: transactions are explicit BEGIN IMMEDIATE blocks
+        self.db = sqlite3.connect(path, timeout=BUSY_TIMEOUT, isolation_level=None, check_same_thread=False)
+        self.db.execute(
+            """CREATE TABLE IF NOT EXISTS jobs (
+                   id INTEGER PRIMARY KEY,
+                   site TEXT NOT NULL,
+                   link TEXT NOT NULL,
+                   priority REAL NOT NULL DEFAULT 0,
+                   account TEXT,
+                   status TEXT NOT NULL DEFAULT 'pending',
+                   attempts INTEGER NOT NULL DEFAULT 0,
+                   lease_owner TEXT,
+                   lease_expires REAL,
+                   last_error TEXT,
+                   updated_at REAL NOT NULL,
+                   UNIQUE (site, link)
+               )"""
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS jobs_next ON jobs (site, status, priority)")
+
+    def _write(self, sql, params=()):
+        with self.lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = self.db.execute(sql, params)
+                self.db.execute("COMMIT")
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+        return cursor.rowcount
+
+    # ---------- producers ----------
+    def enqueue(self, site, links, account=None):
+        """Add links, best first; links already queued, done or dead are left as they are.
+
+        Returns how many were new.
+        """
+        links = list(links)
+        now = time.time()
+        rows = [(site, link, len(links) - rank, account, now) for rank, link in enumerate(links)]
+        with self.lock:
+            before = self.db.total_changes
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                self.db.executemany(
+                    "INSERT OR IGNORE INTO jobs (site, link, priority, account, updated_at) VALUES (?, ?, ?, ?, ?)",
+                    rows)
+                self.db.execute("COMMIT")
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+            return self.db.total_changes - before
+
+    def requeue(self, site, links=None, status="dead"):
+        """Give dead (or done) jobs a fresh set of attempts, e.g. after a selector fix"""
+        sql = "UPDATE jobs SET status = 'pending', attempts = 0, last_error = NULL, updated_at = ? WHERE site = ? AND status = ?"
+        if links is None:
+            return self._write(sql, (time.time(), site, status))
+        return sum(self._write(sql + " AND link = ?", (time.time(), site, status, link)) for link in links)
+
+    def links(self, site):
+        """Every link queued for `site`, whatever its status"""
+        with self.lock:
+            return {link for (link,) in self.db.execute("SELECT link FROM jobs WHERE site = ?", (site,))}
+
+    # ---------- consumers ----------
+    def lease(self, site, owner, account=None):
+        """Claim the best available job for `site` (and `account`); returns (job_id, link) or None"""
+        now = time.time()
+        with self.lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                # Leases whose worker vanished count as a failed attempt
+                self.db.execute(
+                    """UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'dead' ELSE 'pending' END,
+                           last_error = 'lease expired (' || lease_owner || ')', lease_owner = NULL, updated_at = ?
+                       WHERE site = ? AND status = 'leased' AND lease_expires < ?""",
+                    (self.max_attempts, now, site, now))
+                row = self.db.execute(
+                    """SELECT id, link FROM jobs
+                       WHERE site = ? AND status = 'pending' AND (account IS NULL OR account = ?)
+                       ORDER BY priority DESC, id LIMIT 1""",
+                    (site, account)).fetchone()
+                if row is not None:
+                    self.db.execute(
+                        """UPDATE jobs SET status = 'leased', attempts = attempts + 1, lease_owner = ?,
+                               lease_expires = ?, updated_at = ? WHERE id = ?""",
+                        (owner, now + self.lease_seconds, now, row[0]))
+                self.db.execute("COMMIT")
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+        return row
+
+    def extend(self, job_id, owner):
+        """Push the lease deadline back for a job that is still in progress"""
+        return self._write(
+            "UPDATE jobs SET lease_expires = ? WHERE id = ? AND lease_owner = ? AND status = 'leased'",
+            (time.time() + self.lease_seconds, job_id, owner)) == 1
+
+    def complete(self, job_id, owner):
+        return self._write(
+            """UPDATE jobs SET status = 'done', lease_owner = NULL, last_error = NULL, updated_at = ?
+               WHERE id = ? AND lease_owner = ?""",
+            (time.time(), job_id, owner)) == 1
+
+    def fail(self, job_id, owner, error=""):
+        """Retry later, or dead-letter the job once it has used up its attempts"""
+        return self._write(
+            """UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'dead' ELSE 'pending' END,
+                   lease_owner = NULL, last_error = ?, updated_at = ?
+               WHERE id = ? AND lease_owner = ?""",
+            (self.max_attempts, str(error)[:500], time.time(), job_id, owner)) == 1
+
+    def release(self, job_id, owner):
+        """Hand a job back without spending an attempt (e.g. the account got quarantined)"""
+        return self._write(
+            """UPDATE jobs SET status = 'pending', attempts = attempts - 1, lease_owner = NULL, updated_at = ?
+               WHERE id = ? AND lease_owner = ?""",
+            (time.time(), job_id, owner)) == 1
+
+    # ---------- reporting ----------
+    def stats(self, site=None):
+        with self.lock:
+            if site is None:
+                rows = self.db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")
+            else:
+                rows = self.db.execute("SELECT status, COUNT(*) FROM jobs WHERE site = ? GROUP BY status", (site,))
+            return dict(rows.fetchall())
+
+    def dead(self, site):
+        with self.lock:
+            return self.db.execute(
+                "SELECT link, attempts, last_error FROM jobs WHERE site = ? AND status = 'dead' ORDER BY updated_at",
+                (site,)).fetchall()
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect or repair the shared work queue")
+    parser.add_argument("site", choices=["linkedin", "facebook"])
+    parser.add_argument("--dead", action="store_true", help="list dead-lettered links")
+    parser.add_argument("--requeue-dead", action="store_true", help="give dead jobs fresh attempts")
+    args = parser.parse_args()
+
+    wq = WorkQueue()
+    if args.requeue_dead:
+        print(f"♻️ {wq.requeue(args.site)} dead {args.site} jobs back in the queue")
+    if args.dead:
+        for link, attempts, error in wq.dead(args.site):
+            print(f"💀 {link} ({attempts} attempts): {error}")
+    print(f"📬 {args.site}: {wq.stats(args.site)}")
+    wq.close()